@@ -1,10 +1,21 @@
+import json
+import logging
+import math
+import os
 import threading
 import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import unquote
 
 import dash
-from dash import Input, Output, State, dcc, html, dash_table
+import flask
+import pandas as pd
+from dash import ALL, MATCH, ClientsideFunction, Input, Output, State, dcc, html, dash_table
+from dash.exceptions import PreventUpdate
 
+from components.controls import filter_id, pane_id
 from components.graphs import (
     build_area,
     build_bar,
@@ -12,46 +23,104 @@ from components.graphs import (
     build_histogram,
     build_line,
     build_scatter,
+    THEME_LAYOUTS,
+    theme_layout,
 )
-from layouts.example_layout import (
-    MAIN_CONTENT_ID as EXAMPLE_CONTENT_ID,
-    SECONDARY_CONTENT_ID as EXAMPLE_SECONDARY_CONTENT_ID,
-    VIEW_CONTAINER_ID as EXAMPLE_VIEW_CONTAINER_ID,
-    example_layout,
+from layouts.example_layout import example_layout
+from layouts.dashboard import PANES, VIEW_CONTAINER_ID
+from layouts.home_layout import home_layout
+from utils.background import background_callback_manager, finished_result, job_key, run_deduplicated
+from utils.data_loader import (
+    NUMERIC_METRICS,
+    dataset_cache,
+    dataset_fingerprint,
+    dataset_schema,
+    load_dataset,
+    load_summary,
+    prepare_dataset,
+    resolve_dataset_path,
+    schema_cache,
+    summary_cache,
 )
-from layouts.home_layout import (
-    MAIN_CONTENT_ID as HOME_CONTENT_ID,
-    SECONDARY_CONTENT_ID as HOME_SECONDARY_CONTENT_ID,
-    VIEW_CONTAINER_ID as HOME_VIEW_CONTAINER_ID,
-    home_layout,
+from utils.downsample import MAX_POINTS
+from utils.column_index import index_cache
+from utils.columnar import has_fresh_columnar
+from utils.figure_cache import figure_cache, figure_cache_stats, figure_key, get_figure, has_figure, put_figure
+from utils.filters import filter_options, is_range_column, mask_cache, normalize_filter
+from utils.metrics import install_metrics, pane_task, register_cache, timed, timed_callback
+from utils.table_query import PAGE_SIZE, query_page
+from utils.file_utils import (
+    append_upload_chunk,
+    finalize_chunked_upload,
+    list_available_datasets,
+    save_uploaded_file,
 )
-from utils.data_loader import build_summary, detect_numeric_columns, load_dataset
-from utils.file_utils import ensure_data_dirs_exist, list_available_datasets, save_uploaded_file
 
-ensure_data_dirs_exist()
-
-app = dash.Dash(__name__, suppress_callback_exceptions=True)
+app = dash.Dash(
+    __name__,
+    suppress_callback_exceptions=True,
+    background_callback_manager=background_callback_manager,
+)
 server = app.server
+install_metrics(app)
+register_cache("datasets", dataset_cache)
+register_cache("summaries", summary_cache)
+register_cache("schemas", schema_cache)
+register_cache("figures", figure_cache)
+register_cache("filter_masks", mask_cache)
+register_cache("column_indexes", index_cache)
 
 app.layout = html.Div(
     id="app-root",
     className="theme-light",
-    children=[dcc.Location(id="url"), html.Div(id="page-content")],
+    children=[dcc.Location(id="url"), dcc.Store(id="theme-layouts", data=THEME_LAYOUTS), html.Div(id="page-content")],
 )
 
 
 @app.callback(Output("page-content", "children"), Input("url", "pathname"))
+@timed_callback
 def display_page(pathname):
     if pathname == "/example":
         return example_layout()
     return home_layout()
 
 
-@app.callback(Output("app-root", "className"), Input("theme-toggle", "value"))
-def toggle_theme(theme_value):
-    if theme_value == "dark":
-        return "theme-dark"
-    return "theme-light"
+# Purely presentational callbacks run in the browser (assets/presentation.js).
+app.clientside_callback(
+    ClientsideFunction("presentation", "themeClass"),
+    Output("app-root", "className"),
+    Input("theme-toggle", "value"),
+)
+
+
+@server.route("/upload/chunk", methods=["POST"])
+def upload_chunk():
+    headers = flask.request.headers
+    upload_id = headers.get("X-Upload-Id", "")
+    filename = unquote(headers.get("X-Filename", ""))
+    try:
+        received = append_upload_chunk(upload_id, int(headers.get("X-Chunk-Offset", "0")), flask.request.stream)
+        if headers.get("X-Chunk-Final") != "true":
+            return flask.jsonify({"received": received})
+        saved_value = finalize_chunked_upload(upload_id, filename)
+    except ValueError as error:
+        return flask.jsonify({"error": str(error)}), 400
+    # Parsing and indexing run in handle_file_upload's background job, not in this request.
+    return flask.jsonify({"received": received, "value": saved_value, "filename": filename})
+
+
+@server.route("/cache/stats")
+def cache_stats():
+    return flask.jsonify(
+        {
+            "datasets": dataset_cache.stats(),
+            "summaries": summary_cache.stats(),
+            "schemas": schema_cache.stats(),
+            "figures": figure_cache_stats(),
+            "filter_masks": mask_cache.stats(),
+            "column_indexes": index_cache.stats(),
+        }
+    )
 
 
 @app.callback(
@@ -59,49 +128,122 @@ def toggle_theme(theme_value):
     Output("dataset-dropdown", "value"),
     Output("last-uploaded-filename", "children"),
     Input("upload-data", "contents"),
+    Input("chunked-upload-result", "data"),
     State("upload-data", "filename"),
     prevent_initial_call=True,
+    background=True,
+    running=[
+        (Output("upload-data", "disabled"), True, False),
+        (Output("chunked-upload-status", "children"), "Processing upload...", ""),
+    ],
 )
-def handle_file_upload(contents, filename):
-    if not contents or not filename:
-        return dash.no_update, dash.no_update, dash.no_update
-
-    saved_value = save_uploaded_file(contents, filename)
-    options = list_available_datasets()
+@timed_callback
+def handle_file_upload(contents, chunked_result, filename):
+    if dash.ctx.triggered_id == "chunked-upload-result":
+        if not chunked_result:
+            return dash.no_update, dash.no_update, dash.no_update
+        saved_value, filename = chunked_result["value"], chunked_result["filename"]
+    else:
+        if not contents or not filename:
+            return dash.no_update, dash.no_update, dash.no_update
+        saved_value = save_uploaded_file(contents, filename)
+    prepare_dataset(saved_value)
+    options = list_available_datasets(selected=saved_value)
     status = f"Last uploaded file: {filename}"
     return options, saved_value, status
 
 
-def _build_table_view(df):
+@app.callback(
+    Output("dataset-dropdown", "options", allow_duplicate=True),
+    Input("dataset-dropdown", "search_value"),
+    State("dataset-dropdown", "value"),
+    prevent_initial_call=True,
+)
+@timed_callback
+def search_datasets(search_value, current_value):
+    # The dropdown only holds one page of uploads; each keystroke queries the catalog for the rest.
+    if search_value is None:
+        raise PreventUpdate
+    return list_available_datasets(search_value, selected=current_value)
+
+
+def _table_column(df, col):
+    if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+        return {"name": col, "id": col, "type": "numeric"}
+    if pd.api.types.is_datetime64_any_dtype(df[col]):
+        return {"name": col, "id": col, "type": "datetime"}
+    return {"name": col, "id": col, "type": "text"}
+
+
+@timed("render")
+def _build_table_view(df, pane="primary"):
     return html.Div(
         className="table-container",
         children=[
             dash_table.DataTable(
-                data=df.head(50).to_dict("records"),
-                columns=[{"name": col, "id": col} for col in df.columns],
-                page_action="none",
+                id={"type": "data-table", "pane": pane},
+                data=df.head(PAGE_SIZE).to_dict("records"),
+                columns=[_table_column(df, col) for col in df.columns],
+                page_action="custom",
+                page_current=0,
+                page_size=PAGE_SIZE,
+                page_count=max(math.ceil(len(df) / PAGE_SIZE), 1),
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
                 style_table={"overflowX": "auto"},
             )
         ],
     )
 
 
-def _build_summary_view(df):
-    summary = build_summary(df)
+@app.callback(
+    Output({"type": "data-table", "pane": MATCH}, "data"),
+    Output({"type": "data-table", "pane": MATCH}, "page_count"),
+    Input({"type": "data-table", "pane": MATCH}, "page_current"),
+    Input({"type": "data-table", "pane": MATCH}, "page_size"),
+    Input({"type": "data-table", "pane": MATCH}, "sort_by"),
+    Input({"type": "data-table", "pane": MATCH}, "filter_query"),
+    State("dataset-dropdown", "value"),
+    State("filter-spec", "data"),
+    prevent_initial_call=True,
+)
+@timed_callback
+def update_table_page(page_current, page_size, sort_by, filter_query, selected_dataset, filters):
+    df = load_dataset(selected_dataset, filters=filters)
+    fingerprint = dataset_fingerprint(selected_dataset, filters)
+    return query_page(df, page_current, page_size, sort_by, filter_query, fingerprint)
+
+
+@timed("render")
+def _build_summary_view(summary):
     numeric_summary = summary.get("numeric_summary", {})
     cards = [
         html.Div(className="summary-card", children=[html.H4("Rows"), html.P(summary["n_rows"])]),
         html.Div(className="summary-card", children=[html.H4("Columns"), html.P(summary["n_columns"])]),
         html.Div(
             className="summary-card",
-            children=[html.H4("Column Names"), html.P(", ".join(summary["columns"]))],
+            children=[html.H4("Column Names"), html.P(", ".join(map(str, summary["columns"])))],
         ),
     ]
+    memory = summary.get("memory")
+    if memory and memory["default_bytes"]:
+        saved = 1 - memory["typed_bytes"] / memory["default_bytes"]
+        cards.append(
+            html.Div(
+                className="summary-card",
+                children=[
+                    html.H4("Memory"),
+                    html.P(f"{memory['typed_bytes'] / 2**20:.1f} MB ({saved:.0%} saved by typed parsing)"),
+                ],
+            )
+        )
 
     if numeric_summary:
-        metrics = ["mean", "min", "max"]
         stats_rows = []
-        for metric in metrics:
+        for metric in NUMERIC_METRICS:
             row = {"metric": metric}
             for col, stats in numeric_summary.items():
                 if metric in stats:
@@ -123,216 +265,533 @@ def _build_summary_view(df):
             )
         )
 
+    column_summary = summary.get("column_summary", {})
+    if column_summary:
+        cards.append(
+            html.Div(
+                className="summary-card",
+                children=[
+                    html.H4("Column Details"),
+                    dash_table.DataTable(
+                        data=[{"column": col, **details} for col, details in column_summary.items()],
+                        columns=[
+                            {"name": "Column", "id": "column"},
+                            {"name": "Type", "id": "dtype"},
+                            {"name": "Count", "id": "count"},
+                            {"name": "Nulls", "id": "nulls"},
+                            {"name": "Distinct", "id": "distinct"},
+                        ],
+                        style_table={"overflowX": "auto"},
+                    ),
+                ],
+            )
+        )
+
     return html.Div(className="summary-grid", children=cards)
 
 
-def _build_chart_view(df, chart_type, x_value, y_value, color_column, color_value):
-    if chart_type == "bar":
-        return build_bar(df, x_value, y_value, color_column, color_value)
-    if chart_type == "scatter":
-        return build_scatter(df, x_value, y_value, color_column, color_value)
-    if chart_type == "line":
-        return build_line(df, x_value, y_value, color_column, color_value)
-    if chart_type == "area":
-        return build_area(df, x_value, y_value, color_column, color_value)
-    if chart_type == "box":
-        return build_box(df, x_value, y_value, color_column, color_value)
-    return build_histogram(df, x_value, color_column, color_value)
+CHART_BUILDERS = {"bar": build_bar, "scatter": build_scatter, "line": build_line, "area": build_area, "box": build_box}
+ZOOMABLE_CHART_TYPES = {"scatter", "line", "area"}
+BACKGROUND_MIN_ROWS = int(os.environ.get("DASH_BORED_BACKGROUND_ROWS", "1000000"))
+PANE_THREADS = int(os.environ.get("DASH_BORED_PANE_THREADS", str(min(os.cpu_count() or 1, 4))))
+# Threads rather than processes, so panes share this worker's cached frames without copying them.
+_pane_pool = ThreadPoolExecutor(max_workers=max(PANE_THREADS, 1), thread_name_prefix="pane")
+pane_log = logging.getLogger("dash_bored.panes")
 
 
-def _render_view(df, view_type, chart_type, x_value, y_value, color_column=None, color_value=None):
+def _chart_spec(
+    dataset, chart_type, x_value, y_value, color_column, color_value=None, theme=None, x_range=None, filters=None
+):
+    return {
+        "dataset": dataset,
+        "chart_type": chart_type if chart_type in CHART_BUILDERS else "histogram",
+        "x": x_value,
+        "y": y_value,
+        "color_column": color_column,
+        "color_value": color_value,
+        "theme": theme,
+        "x_range": x_range,
+        "filters": filters or [],
+    }
+
+
+def _spec_columns(spec):
+    if spec["chart_type"] == "histogram":
+        columns = [spec["x"], spec["color_column"]]
+    else:
+        columns = [spec["x"], spec["y"], spec["color_column"]]
+    return [col for col in columns if col]
+
+
+def _chart_figure(spec, report_progress=None, load_columns=None):
+    """Return ``(figure, rows, message)`` for a chart spec, served from the figure cache when possible.
+
+    ``load_columns`` widens the projection that is loaded, so charts rendered
+    together can share one preloaded frame.
+    """
+    fingerprint = dataset_fingerprint(spec["dataset"])
+    if fingerprint is None:
+        return None, 0, html.Div("No data available for this selection.")
+    key = figure_key(fingerprint, spec)
+    cached = get_figure(key)
+    if cached is not None:
+        return json.loads(cached["figure"]), cached["rows"], None
+
+    columns = load_columns or _spec_columns(spec) or None
+    df = load_dataset(spec["dataset"], columns=columns, filters=spec["filters"])
     if df.empty:
-        return html.Div("No data available for this selection.")
+        return None, 0, html.Div("No data available for this selection.")
+    if report_progress:
+        report_progress("Rendering chart...")
+    if spec["chart_type"] == "histogram":
+        graph = build_histogram(df, spec["x"], spec["color_column"], spec["color_value"])
+    else:
+        zoom_kwargs = {"x_range": spec["x_range"]} if spec["x_range"] else {}
+        graph = CHART_BUILDERS[spec["chart_type"]](
+            df, spec["x"], spec["y"], spec["color_column"], spec["color_value"], **zoom_kwargs
+        )
+    if not isinstance(graph, dcc.Graph):
+        return None, 0, graph
+    figure = graph.figure.update_layout(**theme_layout(spec["theme"]))
+    put_figure(key, figure.to_json(), len(df))
+    return figure, len(df), None
+
+
+def _build_chart_view(spec, pane, report_progress=None, load_columns=None):
+    figure, rows, message = _chart_figure(spec, report_progress, load_columns)
+    if figure is None:
+        return message
+    graph = dcc.Graph(id=pane_id("chart-graph", pane), figure=figure)
+    # Every chart gets the store, since refine_zoomed_chart reads it for any chart-graph;
+    # only downsampled charts are marked for reloading on zoom.
+    zoom_spec = {
+        "dataset": spec["dataset"],
+        "chart_type": spec["chart_type"],
+        "x": spec["x"],
+        "y": spec["y"],
+        "color_column": spec["color_column"],
+        "filters": spec["filters"],
+        "sampled": spec["chart_type"] in ZOOMABLE_CHART_TYPES and rows > MAX_POINTS > 0,
+    }
+    return html.Div([graph, dcc.Store(id=pane_id("chart-spec", pane), data=zoom_spec)])
+
+
+@app.callback(
+    Output(pane_id("chart-graph", MATCH), "figure"),
+    Input(pane_id("chart-graph", MATCH), "relayoutData"),
+    State(pane_id("chart-spec", MATCH), "data"),
+    State(pane_id("color-picker", MATCH), "value"),
+    State("theme-toggle", "value"),
+    prevent_initial_call=True,
+)
+@timed_callback
+def refine_zoomed_chart(relayout_data, zoom_spec, color_value, theme):
+    if not relayout_data or not zoom_spec or not zoom_spec["sampled"]:
+        return dash.no_update
+    if "xaxis.range[0]" in relayout_data:
+        x_range = [relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"]]
+    elif "xaxis.range" in relayout_data:
+        x_range = relayout_data["xaxis.range"]
+    elif relayout_data.get("xaxis.autorange"):
+        x_range = None
+    else:
+        return dash.no_update
+
+    spec = _chart_spec(
+        zoom_spec["dataset"],
+        zoom_spec["chart_type"],
+        zoom_spec["x"],
+        zoom_spec["y"],
+        zoom_spec["color_column"],
+        color_value,
+        theme,
+        x_range,
+        zoom_spec.get("filters"),
+    )
+    figure, _, _ = _chart_figure(spec)
+    return figure if figure is not None else dash.no_update
+
+
+# Color and theme changes patch the drawn charts' layout in the browser.
+app.clientside_callback(
+    ClientsideFunction("presentation", "recolorCharts"),
+    Output(pane_id("chart-graph", ALL), "figure", allow_duplicate=True),
+    Input(pane_id("color-picker", ALL), "value"),
+    State(pane_id("chart-graph", ALL), "id"),
+    prevent_initial_call=True,
+)
+
+
+app.clientside_callback(
+    ClientsideFunction("presentation", "rethemeCharts"),
+    Output(pane_id("chart-graph", ALL), "figure", allow_duplicate=True),
+    Input("theme-toggle", "value"),
+    State(pane_id("chart-graph", ALL), "id"),
+    State("theme-layouts", "data"),
+    prevent_initial_call=True,
+)
+
+
+def _render_view(
+    dataset,
+    view_type,
+    chart_type,
+    x_value,
+    y_value,
+    color_column=None,
+    color_value=None,
+    pane="primary",
+    theme=None,
+    filters=None,
+    report_progress=None,
+    load_columns=None,
+):
     if view_type == "summary":
-        return _build_summary_view(df)
+        summary = load_summary(dataset, filters)
+        if not summary or not summary["n_rows"]:
+            return html.Div("No data available for this selection.")
+        return _build_summary_view(summary)
     if view_type == "chart":
-        return _build_chart_view(df, chart_type, x_value, y_value, color_column, color_value)
-    return _build_table_view(df)
+        spec = _chart_spec(dataset, chart_type, x_value, y_value, color_column, color_value, theme, filters=filters)
+        return _build_chart_view(spec, pane, report_progress, load_columns)
+    df = load_dataset(dataset, filters=filters)
+    if df.empty:
+        return html.Div("No data available for this selection.")
+    return _build_table_view(df, pane)
 
 
 @app.callback(
-    Output("x-axis-column", "options"),
-    Output("y-axis-column", "options"),
-    Output("x-axis-column", "value"),
-    Output("y-axis-column", "value"),
-    Output("color-column", "options"),
-    Output("color-column", "value"),
+    Output(pane_id("x-axis", ALL), "options"),
+    Output(pane_id("y-axis", ALL), "options"),
+    Output(pane_id("x-axis", ALL), "value"),
+    Output(pane_id("y-axis", ALL), "value"),
+    Output(pane_id("color-column", ALL), "options"),
+    Output(pane_id("color-column", ALL), "value"),
+    Output(filter_id("filter-column", ALL), "options"),
+    Output(filter_id("filter-column", ALL), "value"),
     Input("dataset-dropdown", "value"),
 )
+@timed_callback
 def update_axis_options(selected_dataset):
-    df = load_dataset(selected_dataset)
-    if df.empty:
-        return [], [], None, None, [], None
-    numeric_cols = detect_numeric_columns(df)
-    x_default = numeric_cols[0] if numeric_cols else (df.columns[0] if not df.empty else None)
+    n_panes = len(dash.ctx.outputs_list[0])
+    n_filters = len(dash.ctx.outputs_list[6])
+    schema = dataset_schema(selected_dataset)
+    columns, numeric_cols = schema["columns"], schema["numeric"]
+    if not columns:
+        return (
+            [[]] * n_panes,
+            [[]] * n_panes,
+            [None] * n_panes,
+            [None] * n_panes,
+            [[]] * n_panes,
+            [None] * n_panes,
+            [[]] * n_filters,
+            [None] * n_filters,
+        )
+    x_default = numeric_cols[0] if numeric_cols else columns[0]
     y_default = numeric_cols[0] if numeric_cols else None
 
-    x_options = [{"label": col, "value": col} for col in df.columns]
+    x_options = [{"label": col, "value": col} for col in columns]
     y_options = [{"label": col, "value": col} for col in numeric_cols]
-    color_options = [{"label": col, "value": col} for col in df.columns]
-    return x_options, y_options, x_default, y_default, color_options, None
+    return (
+        [x_options] * n_panes,
+        [y_options] * n_panes,
+        [x_default] * n_panes,
+        [y_default] * n_panes,
+        [x_options] * n_panes,
+        [None] * n_panes,
+        [x_options] * n_filters,
+        [None] * n_filters,
+    )
 
 
 @app.callback(
-    Output("compare-x-axis", "options"),
-    Output("compare-y-axis", "options"),
-    Output("compare-x-axis", "value"),
-    Output("compare-y-axis", "value"),
-    Output("compare-color-column", "options"),
-    Output("compare-color-column", "value"),
-    Input("dataset-dropdown", "value"),
+    Output(filter_id("filter-range", MATCH), "style"),
+    Output(filter_id("filter-categories", MATCH), "style"),
+    Output(filter_id("filter-values", MATCH), "options"),
+    Output(filter_id("filter-values", MATCH), "value"),
+    Output(filter_id("filter-min", MATCH), "value"),
+    Output(filter_id("filter-max", MATCH), "value"),
+    Output(filter_id("filter-min", MATCH), "placeholder"),
+    Output(filter_id("filter-max", MATCH), "placeholder"),
+    Input(filter_id("filter-column", MATCH), "value"),
+    State("dataset-dropdown", "value"),
 )
-def update_compare_axis_options(selected_dataset):
-    df = load_dataset(selected_dataset)
-    if df.empty:
-        return [], [], None, None, [], None
-    numeric_cols = detect_numeric_columns(df)
-    x_default = numeric_cols[0] if numeric_cols else (df.columns[0] if not df.empty else None)
-    y_default = numeric_cols[0] if numeric_cols else None
-
-    x_options = [{"label": col, "value": col} for col in df.columns]
-    y_options = [{"label": col, "value": col} for col in numeric_cols]
-    color_options = [{"label": col, "value": col} for col in df.columns]
-    return x_options, y_options, x_default, y_default, color_options, None
+@timed_callback
+def update_filter_inputs(column, selected_dataset):
+    """Show min/max inputs for numeric and date columns and a value picker for the rest."""
+    schema = dataset_schema(selected_dataset)
+    hidden = {"display": "none"}
+    if column not in schema["dtypes"]:
+        return None, hidden, [], [], None, None, "Min", "Max"
+    dtype_name = schema["dtypes"][column]
+    if dtype_name.startswith("datetime64"):
+        return None, hidden, [], [], None, None, "From (YYYY-MM-DD)", "To (YYYY-MM-DD)"
+    if is_range_column(dtype_name, column in schema["numeric"]):
+        stats = (load_summary(selected_dataset) or {}).get("numeric_summary", {}).get(column, {})
+        low, high = stats.get("min"), stats.get("max")
+        return (
+            None,
+            hidden,
+            [],
+            [],
+            None,
+            None,
+            "Min" if low is None else f"Min ({low:g})",
+            "Max" if high is None else f"Max ({high:g})",
+        )
+    options = filter_options(load_dataset(selected_dataset, columns=[column])[column])
+    return hidden, None, options, [], None, None, "Min", "Max"
 
 
 @app.callback(
-    Output(HOME_CONTENT_ID, "children"),
-    Output(HOME_SECONDARY_CONTENT_ID, "children"),
-    Output(HOME_VIEW_CONTAINER_ID, "className"),
-    Output("comparison-controls", "style"),
-    Input("dataset-dropdown", "value"),
-    Input("view-type", "value"),
-    Input("chart-type", "value"),
-    Input("x-axis-column", "value"),
-    Input("y-axis-column", "value"),
-    Input("color-column", "value"),
-    Input("color-picker", "value"),
-    Input("comparison-toggle", "value"),
-    Input("compare-view-type", "value"),
-    Input("compare-chart-type", "value"),
-    Input("compare-x-axis", "value"),
-    Input("compare-y-axis", "value"),
-    Input("compare-color-column", "value"),
-    Input("compare-color-picker", "value"),
+    Output("filter-spec", "data"),
+    Output("filter-status", "children"),
+    Input(filter_id("filter-column", ALL), "value"),
+    Input(filter_id("filter-min", ALL), "value"),
+    Input(filter_id("filter-max", ALL), "value"),
+    Input(filter_id("filter-values", ALL), "value"),
+    State("dataset-dropdown", "value"),
+    State("filter-spec", "data"),
 )
-def update_main_content(
-    selected_dataset,
-    view_type,
-    chart_type,
-    x_value,
-    y_value,
-    color_column,
-    color_value,
-    comparison_toggle,
-    compare_view_type,
-    compare_chart_type,
-    compare_x_value,
-    compare_y_value,
-    compare_color_column,
-    compare_color_value,
+@timed_callback
+def update_filter_spec(columns, lows, highs, values, selected_dataset, current_filters):
+    """Collect the filter rows into one spec; every pane re-renders when it changes."""
+    schema = dataset_schema(selected_dataset)
+    filters = [
+        predicate
+        for predicate in map(partial(normalize_filter, schema), columns, lows, highs, values)
+        if predicate is not None
+    ]
+    status = ""
+    if filters:
+        summary = load_summary(selected_dataset)
+        total = summary["n_rows"] if summary else 0
+        status = f"{len(load_dataset(selected_dataset, filters=filters)):,} of {total:,} rows match the filters."
+    return (dash.no_update if filters == current_filters else filters), status
+
+
+def _pane_visible(pane, pane_count):
+    return PANES.index(pane) < (pane_count or 1)
+
+
+app.clientside_callback(
+    ClientsideFunction("presentation", "layoutMode"),
+    Output(VIEW_CONTAINER_ID, "className"),
+    Output(pane_id("pane-controls", ALL), "style"),
+    Output(pane_id("pane-card", ALL), "style"),
+    Input("pane-count", "value"),
+)
+
+
+def _needs_background(
+    dataset, view_type, chart_type, x_value, y_value, color_column, color_value, theme, filters=None
 ):
-    df = load_dataset(selected_dataset)
-    primary_view = _render_view(df, view_type, chart_type, x_value, y_value, color_column, color_value)
-
-    show_comparison = comparison_toggle and "enabled" in comparison_toggle
-    comparison_style = {"display": "flex"} if show_comparison else {"display": "none"}
-    container_class = "view-grid" if show_comparison else "view-single"
-
-    if not show_comparison:
-        return primary_view, html.Div(className="view-placeholder"), container_class, comparison_style
-
-    comparison_view = _render_view(
-        df,
-        compare_view_type,
-        compare_chart_type,
-        compare_x_value,
-        compare_y_value,
-        compare_color_column,
-        compare_color_value,
+    """Whether a view is slow enough to render in a background job rather than in this worker.
+
+    That is a dataset without a current Arrow file (the source has to be
+    parsed) or an uncached chart over at least ``BACKGROUND_MIN_ROWS`` rows.
+    Everything else renders in-process against the warm caches.
+    """
+    dataset_path = resolve_dataset_path(dataset)
+    if dataset_path is None or not dataset_path.exists():
+        return False
+    if not has_fresh_columnar(dataset_path):
+        return True
+    if view_type != "chart" or not 0 < BACKGROUND_MIN_ROWS:
+        return False
+    spec = _chart_spec(dataset, chart_type, x_value, y_value, color_column, color_value, theme, filters=filters)
+    if has_figure(figure_key(dataset_fingerprint(dataset), spec)):
+        return False
+    summary = load_summary(dataset)
+    return bool(summary) and summary["n_rows"] >= BACKGROUND_MIN_ROWS
+
+
+def _panes_to_render(pane_ids):
+    """The panes an input change affects: all of them for a new dataset, else the ones whose controls changed."""
+    triggered = dash.ctx.triggered_prop_ids
+    if not triggered or "dataset-dropdown.value" in triggered or "filter-spec.data" in triggered:
+        return list(pane_ids)
+    if "pane-count.value" in triggered:
+        return [pane for pane in pane_ids if pane != "primary"]
+    changed = {component_id["pane"] for component_id in triggered.values() if isinstance(component_id, dict)}
+    return [pane for pane in pane_ids if pane in changed]
+
+
+def _needs_rows(view_args):
+    dataset, view_type, chart_type, x_value, y_value, color_column, color_value, _, theme, filters = view_args
+    if view_type == "summary":
+        return False
+    if view_type != "chart":
+        return True
+    spec = _chart_spec(dataset, chart_type, x_value, y_value, color_column, color_value, theme, filters=filters)
+    return not has_figure(figure_key(dataset_fingerprint(dataset), spec))
+
+
+def _preload(selected_dataset, views):
+    """Load what several panes will read once, so they share one cached, read-only frame.
+
+    Tables and filtered views read the whole (filtered) dataset; unfiltered
+    charts only need the union of their columns. Returns that union for the
+    charts to load, or None when they load as usual.
+    """
+    loading = [view_args for view_args in views.values() if _needs_rows(view_args)]
+    if len(loading) < 2:
+        return None
+    filters = loading[0][9]
+    if filters or any(view_args[1] != "chart" for view_args in loading):
+        load_dataset(selected_dataset, filters=filters)
+        return None
+    columns = list(
+        dict.fromkeys(
+            column
+            for dataset, _, chart_type, x_value, y_value, color_column, *_ in loading
+            for column in _spec_columns(_chart_spec(dataset, chart_type, x_value, y_value, color_column))
+        )
     )
-    return primary_view, comparison_view, container_class, comparison_style
+    load_dataset(selected_dataset, columns=columns)
+    return columns
 
 
-@app.callback(
-    Output("example-x-axis", "options"),
-    Output("example-y-axis", "options"),
-    Output("example-x-axis", "value"),
-    Output("example-y-axis", "value"),
-    Output("example-color-column", "options"),
-    Output("example-color-column", "value"),
-    Input("dataset-dropdown", "value"),
-)
-def update_example_axis_options(selected_dataset):
-    df = load_dataset(selected_dataset)
-    if df.empty:
-        return [], [], None, None, [], None
-    numeric_cols = detect_numeric_columns(df)
-    x_default = numeric_cols[0] if numeric_cols else (df.columns[0] if not df.empty else None)
-    y_default = numeric_cols[0] if numeric_cols else None
+def _render_pane(*view_args, load_columns=None):
+    # One failing pane shows an error in its card instead of failing every pane.
+    try:
+        return _render_view(*view_args, load_columns=load_columns)
+    except Exception:
+        pane_log.exception("rendering pane %s failed", view_args[7])
+        return html.Div("This view could not be rendered.")
 
-    x_options = [{"label": col, "value": col} for col in df.columns]
-    y_options = [{"label": col, "value": col} for col in numeric_cols]
-    color_options = [{"label": col, "value": col} for col in df.columns]
-    return x_options, y_options, x_default, y_default, color_options, None
+
+def _render_concurrently(selected_dataset, views):
+    """Render ``{pane: view_args}`` on the pane pool and return ``{pane: children}`` once all finish.
+
+    What several panes read is loaded once up front (see ``_preload``). With
+    a single pane or ``PANE_THREADS`` below 2 the panes render in this thread.
+    """
+    render = partial(_render_pane, load_columns=_preload(selected_dataset, views))
+    tasks = {pane: pane_task(pane, view_args[1], render) for pane, view_args in views.items()}
+    if len(views) == 1 or PANE_THREADS < 2:
+        return {pane: tasks[pane](*view_args) for pane, view_args in views.items()}
+    futures = {pane: _pane_pool.submit(tasks[pane], *view_args) for pane, view_args in views.items()}
+    return {pane: future.result() for pane, future in futures.items()}
 
 
 @app.callback(
-    Output(EXAMPLE_CONTENT_ID, "children"),
-    Output(EXAMPLE_SECONDARY_CONTENT_ID, "children"),
-    Output(EXAMPLE_VIEW_CONTAINER_ID, "className"),
-    Output("example-comparison-controls", "style"),
+    Output(pane_id("pane-content", ALL), "children"),
+    Output(pane_id("render-job", ALL), "data"),
     Input("dataset-dropdown", "value"),
-    Input("view-type", "value"),
-    Input("chart-type", "value"),
-    Input("example-x-axis", "value"),
-    Input("example-y-axis", "value"),
-    Input("example-color-column", "value"),
-    Input("example-color-picker", "value"),
-    Input("example-comparison-toggle", "value"),
-    Input("example-view-type", "value"),
-    Input("example-chart-type", "value"),
-    Input("example-compare-x-axis", "value"),
-    Input("example-compare-y-axis", "value"),
-    Input("example-compare-color-column", "value"),
-    Input("example-compare-color-picker", "value"),
+    Input("pane-count", "value"),
+    Input("filter-spec", "data"),
+    Input(pane_id("view-type", ALL), "value"),
+    Input(pane_id("chart-type", ALL), "value"),
+    Input(pane_id("x-axis", ALL), "value"),
+    Input(pane_id("y-axis", ALL), "value"),
+    Input(pane_id("color-column", ALL), "value"),
+    State(pane_id("color-picker", ALL), "value"),
+    State("theme-toggle", "value"),
+    State(pane_id("render-job", ALL), "data"),
 )
-def update_example_content(
+@timed_callback
+def render_panes(
     selected_dataset,
-    view_type,
-    chart_type,
-    x_value,
-    y_value,
-    color_column,
-    color_value,
-    comparison_toggle,
-    compare_view_type,
-    compare_chart_type,
-    compare_x_value,
-    compare_y_value,
-    compare_color_column,
-    compare_color_value,
+    pane_count,
+    filters,
+    view_types,
+    chart_types,
+    x_values,
+    y_values,
+    color_columns,
+    color_values,
+    theme,
+    pending_jobs,
 ):
-    df = load_dataset(selected_dataset)
-    primary_view = _render_view(df, view_type, chart_type, x_value, y_value, color_column, color_value)
-
-    show_comparison = comparison_toggle and "enabled" in comparison_toggle
-    comparison_style = {"display": "flex"} if show_comparison else {"display": "none"}
-    container_class = "view-grid" if show_comparison else "view-single"
-
-    if not show_comparison:
-        return primary_view, html.Div(className="view-placeholder"), container_class, comparison_style
-
-    comparison_view = _render_view(
-        df,
-        compare_view_type,
-        compare_chart_type,
-        compare_x_value,
-        compare_y_value,
-        compare_color_column,
-        compare_color_value,
-    )
-    return primary_view, comparison_view, container_class, comparison_style
+    """Re-render the panes whose inputs changed, concurrently when there are several.
+
+    Views that are already rendered by a finished job are reused, slow ones
+    are handed to ``render_pane_job`` and the rest render in this worker.
+    """
+    # Pattern-matched values arrive as per-type lists; regroup them by pane.
+    controls = {}
+    for values in (*dash.ctx.inputs_list[3:], dash.ctx.states_list[0], dash.ctx.states_list[2]):
+        for item in values:
+            controls.setdefault(item["id"]["pane"], {})[item["id"]["type"]] = item.get("value")
+    pane_ids = [item["id"]["pane"] for item in dash.ctx.outputs_list[0]]
+
+    children = {pane: dash.no_update for pane in pane_ids}
+    jobs = {pane: dash.no_update for pane in pane_ids}
+    views = {}
+    for pane in _panes_to_render(pane_ids):
+        pane_controls = controls.get(pane, {})
+        # Clearing a handed-off job makes the renderer cancel it if it is still running.
+        if pane_controls.get("render-job"):
+            jobs[pane] = None
+        if not _pane_visible(pane, pane_count):
+            children[pane] = html.Div(className="view-placeholder")
+            continue
+        view_args = [
+            selected_dataset,
+            pane_controls.get("view-type"),
+            pane_controls.get("chart-type"),
+            pane_controls.get("x-axis"),
+            pane_controls.get("y-axis"),
+            pane_controls.get("color-column"),
+            pane_controls.get("color-picker"),
+            pane,
+            theme,
+            filters,
+        ]
+        key = job_key(dataset_fingerprint(selected_dataset), *view_args)
+        result = finished_result(key)
+        if result is not None:
+            children[pane] = result
+        elif _needs_background(*view_args[:7], theme, filters):
+            children[pane] = html.Div("Rendering...", className="status-text")
+            jobs[pane] = {"key": key, "view_args": view_args}
+        else:
+            views[pane] = view_args
+    if not views and all(value is dash.no_update for value in (*children.values(), *jobs.values())):
+        raise PreventUpdate
+    if views:
+        children.update(_render_concurrently(selected_dataset, views))
+    return [children[pane] for pane in pane_ids], [jobs[pane] for pane in pane_ids]
+
+
+def _prepare_shared(dataset):
+    """Run ``prepare_dataset`` once for all jobs that need the same dataset version at the same time.
+
+    Every visible pane of a cold dataset gets its own render job; without
+    this each of them would parse the whole file.
+    """
+    run_deduplicated(job_key("prepare", dataset_fingerprint(dataset)), partial(prepare_dataset, dataset))
+
+
+@app.callback(
+    Output(pane_id("pane-content", MATCH), "children", allow_duplicate=True),
+    Input(pane_id("render-job", MATCH), "data"),
+    prevent_initial_call=True,
+    background=True,
+    interval=250,
+    running=[(Output("render-progress", "style"), {"display": "flex"}, {"display": "none"})],
+    progress=[Output("render-progress-bar", "value"), Output("render-progress-label", "children")],
+    progress_default=["0", ""],
+    cancel=[Input("render-progress-cancel", "n_clicks")],
+)
+@timed_callback
+def render_pane_job(set_progress, job):
+    if not job:
+        raise PreventUpdate
+
+    def render():
+        dataset = job["view_args"][0]
+        set_progress(("1", "Loading data..."))
+        # Writes the Arrow and summary files a cold dataset lacks, so later
+        # renders of it stay in the web worker.
+        _prepare_shared(dataset)
+        return _render_view(*job["view_args"], report_progress=lambda label: set_progress(("2", label)))
+
+    result = run_deduplicated(job["key"], render)
+    set_progress(("3", "Done"))
+    return result
 
 
 if __name__ == "__main__":
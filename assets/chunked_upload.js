@@ -0,0 +1,74 @@
+// Streams a selected file to the /upload/chunk endpoint in fixed-size slices so
+// large uploads never have to be base64-encoded into a single callback payload.
+(function () {
+  var CHUNK_BYTES = 8 * 1024 * 1024;
+  var BUTTON_ID = "chunked-upload-button";
+  var STATUS_ID = "chunked-upload-status";
+  var RESULT_ID = "chunked-upload-result";
+
+  function setStatus(text) {
+    window.dash_clientside.set_props(STATUS_ID, { children: text });
+  }
+
+  function newUploadId() {
+    if (window.crypto && window.crypto.randomUUID) {
+      return window.crypto.randomUUID();
+    }
+    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+  }
+
+  async function uploadFile(file) {
+    var uploadId = newUploadId();
+    var offset = 0;
+    var result = null;
+    do {
+      var end = Math.min(offset + CHUNK_BYTES, file.size);
+      var response = await fetch("/upload/chunk", {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/octet-stream",
+          "X-Upload-Id": uploadId,
+          "X-Filename": encodeURIComponent(file.name),
+          "X-Chunk-Offset": String(offset),
+          "X-Chunk-Final": end >= file.size ? "true" : "false",
+        },
+        body: file.slice(offset, end),
+      });
+      result = await response.json();
+      if (!response.ok) {
+        throw new Error(result.error || response.statusText);
+      }
+      offset = result.received;
+      var percent = file.size ? Math.round((offset / file.size) * 100) : 100;
+      setStatus(end >= file.size ? "Processing " + file.name + "..." : "Uploading " + file.name + ": " + percent + "%");
+    } while (offset < file.size);
+    return result;
+  }
+
+  function pickAndUpload() {
+    var input = document.createElement("input");
+    input.type = "file";
+    input.accept = ".csv,.xlsx";
+    input.addEventListener("change", function () {
+      if (!input.files.length) {
+        return;
+      }
+      var file = input.files[0];
+      uploadFile(file)
+        .then(function (result) {
+          // The upload callback shows its own status while it processes the file.
+          window.dash_clientside.set_props(RESULT_ID, { data: { value: result.value, filename: result.filename } });
+        })
+        .catch(function (error) {
+          setStatus("Upload failed: " + error.message);
+        });
+    });
+    input.click();
+  }
+
+  document.addEventListener("click", function (event) {
+    if (event.target.id === BUTTON_ID) {
+      pickAndUpload();
+    }
+  });
+})();
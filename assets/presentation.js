@@ -0,0 +1,60 @@
+// Clientside callbacks for controls that only change how things look: the page
+// theme, which panes are shown and chart colors. They run in the browser, so
+// these interactions never reach a server worker.
+(function () {
+  var HIDDEN = { display: "none" };
+
+  function layoutPatch(layout) {
+    var patch = new window.dash_clientside.Patch();
+    Object.keys(layout).forEach(function (key) {
+      var value = layout[key];
+      if (value !== null && typeof value === "object" && !Array.isArray(value)) {
+        Object.keys(value).forEach(function (subKey) {
+          patch.assign(["layout", key, subKey], value[subKey]);
+        });
+      } else {
+        patch.assign(["layout", key], value);
+      }
+    });
+    return patch.build();
+  }
+
+  window.dash_clientside = window.dash_clientside || {};
+  window.dash_clientside.presentation = {
+    themeClass: function (theme) {
+      return theme === "dark" ? "theme-dark" : "theme-light";
+    },
+
+    // Panes are laid out in order, so the first paneCount of them are shown.
+    layoutMode: function (paneCount) {
+      var count = paneCount || 1;
+      var outputs = window.dash_clientside.callback_context.outputs_list;
+      var styles = outputs[1].map(function (_, index) {
+        return index < count ? null : HIDDEN;
+      });
+      return [count > 1 ? "view-grid" : "view-single", styles, styles];
+    },
+
+    recolorCharts: function (colorValues, graphIds) {
+      var context = window.dash_clientside.callback_context;
+      var triggered = context.triggered_id;
+      var colors = {};
+      context.inputs_list[0].forEach(function (item) {
+        colors[item.id.pane] = item.value;
+      });
+      return graphIds.map(function (graphId) {
+        if (triggered && graphId.pane === triggered.pane && colors[graphId.pane]) {
+          return layoutPatch({ colorway: [colors[graphId.pane]] });
+        }
+        return window.dash_clientside.no_update;
+      });
+    },
+
+    rethemeCharts: function (theme, graphIds, themeLayouts) {
+      var layout = themeLayouts[theme] || themeLayouts.light;
+      return graphIds.map(function () {
+        return layoutPatch(layout);
+      });
+    },
+  };
+})();
@@ -0,0 +1,83 @@
+"""Synthetic datasets for the benchmark suite.
+
+Every dataset mixes the dtypes real uploads contain: integer ids, floats
+with missing values, low- and high-cardinality strings, dates and booleans.
+``narrow`` has 8 columns; ``wide`` adds 40 float and 10 integer measures.
+Rows are generated and written in blocks, so 10M-row CSVs never have to fit
+in memory at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.file_utils import UPLOADS_DIR
+
+BENCH_DIR = UPLOADS_DIR / ".benchmarks"
+BLOCK_ROWS = 500_000
+XLSX_MAX_ROWS = 1_048_575  # Excel's sheet limit, minus the header row
+SHAPES = ("narrow", "wide")
+REGIONS = np.array(["North", "South", "East", "West", "Central"])
+PRODUCTS = np.array([f"Product {i:03d}" for i in range(250)])
+
+
+def parse_rows(text: str) -> int:
+    """Parse ``10k`` / ``2.5m`` / ``1000`` style row counts."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def _block(rng: np.random.Generator, start: int, n_rows: int, shape: str) -> pd.DataFrame:
+    value = rng.normal(100, 25, n_rows)
+    value[rng.random(n_rows) < 0.02] = np.nan
+    frame = {
+        "id": np.arange(start, start + n_rows),
+        "date": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 365 * 4, n_rows), unit="D"),
+        "region": REGIONS[rng.integers(0, len(REGIONS), n_rows)],
+        "product": PRODUCTS[rng.integers(0, len(PRODUCTS), n_rows)],
+        "value": value,
+        "quantity": rng.integers(1, 50, n_rows),
+        "discounted": rng.random(n_rows) < 0.3,
+        "note": np.char.add("order-", rng.integers(0, 10_000_000, n_rows).astype(str)),
+    }
+    if shape == "wide":
+        for i in range(40):
+            frame[f"metric_{i:02d}"] = rng.random(n_rows) * (i + 1)
+        for i in range(10):
+            frame[f"count_{i:02d}"] = rng.integers(0, 1000, n_rows)
+    return pd.DataFrame(frame)
+
+
+def dataset_name(shape: str, n_rows: int, fmt: str) -> str:
+    return f"{shape}_{n_rows}.{fmt}"
+
+
+def generate(shape: str, n_rows: int, fmt: str, seed: int = 0) -> str:
+    """Write a synthetic dataset (reusing an existing one) and return its dataset value.
+
+    The value is what the dataset dropdown would hold, so the benchmark drives
+    ``load_dataset`` and the callbacks exactly like an uploaded file.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape {shape!r}; expected one of {SHAPES}")
+    if fmt == "xlsx" and n_rows > XLSX_MAX_ROWS:
+        raise ValueError(f"XLSX sheets hold at most {XLSX_MAX_ROWS} data rows")
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    name = dataset_name(shape, n_rows, fmt)
+    path = BENCH_DIR / name
+    value = f"uploads/{BENCH_DIR.name}/{name}"
+    if path.exists():
+        return value
+
+    rng = np.random.default_rng(seed)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if fmt == "csv":
+        for start in range(0, n_rows, BLOCK_ROWS):
+            block = _block(rng, start, min(BLOCK_ROWS, n_rows - start), shape)
+            block.to_csv(tmp_path, mode="a" if start else "w", header=not start, index=False)
+    elif fmt == "xlsx":
+        _block(rng, 0, n_rows, shape).to_excel(tmp_path, index=False, engine="openpyxl")
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; expected csv or xlsx")
+    tmp_path.replace(path)
+    return value
@@ -0,0 +1,106 @@
+"""Measure cold-start cost: importing ``app`` and serving the first requests.
+
+Each run starts a fresh interpreter with ``-X importtime`` so nothing is
+warmed up, imports the app, then requests the page, layout and dependency
+endpoints through Flask's test client (the same calls a browser makes before
+the first callback fires).
+
+    python -m benchmarks.startup                 # median of 5 runs + import breakdown
+    python -m benchmarks.startup --budget-ms 1500 --json startup.json
+
+With ``--budget-ms`` the command exits non-zero when the median
+time-to-first-request exceeds the budget, so it can guard CI against import
+regressions.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FIRST_PARTY = ("app", "components", "layouts", "utils")
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.server.test_client()
+for path in ("/", "/_dash-layout", "/_dash-dependencies"):
+    assert client.get(path).status_code == 200, path
+served = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_request_ms": (served - start) * 1000}))
+"""
+
+
+def _parse_importtime(stderr: str) -> dict:
+    """Return ``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_once() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["modules"] = _parse_importtime(result.stderr)
+    return timings
+
+
+def _breakdown(modules: dict, top: int) -> list:
+    """Top-level third-party packages plus first-party modules, by cumulative time."""
+    rows = {}
+    for name, (_, cumulative_us) in modules.items():
+        root = name.split(".")[0]
+        key = name if root in FIRST_PARTY else root
+        rows[key] = max(rows.get(key, 0), cumulative_us)
+    ranked = sorted(rows.items(), key=lambda item: item[1], reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for name, us in ranked[:top]]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="modules to list in the import breakdown")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--budget-ms", type=float, help="fail if median time-to-first-request exceeds this")
+    args = parser.parse_args(argv)
+
+    runs = [run_once() for _ in range(args.runs)]
+    report = {
+        "runs": args.runs,
+        "python": sys.version.split()[0],
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "first_request_ms": round(statistics.median(run["first_request_ms"] for run in runs), 1),
+        "breakdown": _breakdown(runs[-1]["modules"], args.top),
+    }
+
+    print(f"import app:            {report['import_ms']:8.1f} ms (median of {args.runs})")
+    print(f"time to first request: {report['first_request_ms']:8.1f} ms")
+    print("\nslowest imports (cumulative, last run):")
+    for row in report["breakdown"]:
+        print(f"  {row['cumulative_ms']:8.1f} ms  {row['module']}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if args.budget_ms is not None and report["first_request_ms"] > args.budget_ms:
+        print(f"\nFAIL: time to first request exceeds the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
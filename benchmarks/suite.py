@@ -0,0 +1,279 @@
+"""Benchmark the load, summary and chart-render hot paths on synthetic data.
+
+For every requested shape, size and format this generates a dataset (see
+``benchmarks.datasets``), then times each stage the app goes through when a
+user picks it:
+
+* ``parse_source``       - raw CSV/XLSX parse, no caches
+* ``prepare_dataset``    - the upload step: schema inference, columnar conversion
+  + summary file
+* ``load_dataset_cold``  - read from the columnar file with empty memory caches
+* ``load_dataset_warm``  - served from the in-memory dataset cache
+* ``load_projection``    - only the columns one chart needs
+* ``build_summary`` / ``detect_numeric_columns``
+* ``build_<chart>``      - each builder in ``components/graphs.py``
+* ``render_<view>``      - the full pane callback body for table, summary and
+  chart views, cold and (for charts) warm from the figure cache
+
+Each stage records median latency, peak RSS growth over the stage and, where
+something is sent to the browser, the JSON payload size. CSV datasets also
+report the memory their columns take with the inferred types versus default
+inference. Results are written
+as JSON together with the git commit so runs can be compared:
+
+    python -m benchmarks.suite --rows 10k,100k,1m --shapes narrow,wide --formats csv
+    python -m benchmarks.suite --rows 10k --formats csv,xlsx --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import plotly
+import psutil
+
+import app
+from benchmarks.datasets import SHAPES, XLSX_MAX_ROWS, dataset_name, generate, parse_rows
+from components.graphs import build_area, build_bar, build_box, build_histogram, build_line, build_scatter
+from utils.column_index import index_cache, remove_column_index
+from utils.columnar import columnar_path, has_fresh_columnar
+from utils.csv_schema import schema_path
+from utils.data_loader import (
+    SUMMARY_SUFFIX,
+    _parse_source,
+    build_summary,
+    dataset_cache,
+    detect_numeric_columns,
+    load_dataset,
+    load_summary,
+    prepare_dataset,
+    resolve_dataset_path,
+    schema_cache,
+    summary_cache,
+)
+from utils.figure_cache import figure_cache
+from utils.file_utils import sidecar_path
+from utils.filters import mask_cache
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+SAMPLE_SECONDS = 0.005
+
+# chart type -> (builder, x, y, color); "metric" is a float column that exists in both shapes
+CHARTS = {
+    "histogram": (build_histogram, "value", None, "region"),
+    "bar": (build_bar, "region", "quantity", "discounted"),
+    "scatter": (build_scatter, "value", "metric", "region"),
+    "line": (build_line, "date", "value", "region"),
+    "area": (build_area, "id", "value", None),
+    "box": (build_box, "region", "value", "discounted"),
+}
+
+
+class _PeakRSS:
+    """Sample this process's RSS in a thread and keep the peak above the starting value."""
+
+    def __init__(self):
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self.peak_bytes = 0
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_SECONDS):
+            self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss - self._start)
+
+    def __enter__(self):
+        self._start = self._process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss - self._start)
+
+
+def _json_bytes(value) -> int:
+    return len(json.dumps(value, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def _clear_memory_caches():
+    for cache in (dataset_cache, summary_cache, schema_cache, figure_cache, index_cache, mask_cache):
+        cache.clear()
+
+
+def _remove_sidecars(dataset_value):
+    dataset_path = resolve_dataset_path(dataset_value)
+    columnar_path(dataset_path).unlink(missing_ok=True)
+    sidecar_path(dataset_path, SUMMARY_SUFFIX).unlink(missing_ok=True)
+    schema_path(dataset_path).unlink(missing_ok=True)
+    remove_column_index(dataset_path)
+
+
+def _cold_start(dataset_value):
+    _clear_memory_caches()
+    _remove_sidecars(dataset_value)
+
+
+def _run_stage(fn, setup=None, repeat=3, payload=None):
+    """Time ``fn`` ``repeat`` times, running ``setup`` (untimed) before each call."""
+    seconds, peaks, result = [], [], None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with _PeakRSS() as peak:
+            start = time.perf_counter()
+            result = fn()
+            seconds.append(time.perf_counter() - start)
+        peaks.append(peak.peak_bytes)
+    record = {
+        "seconds": round(statistics.median(seconds), 6),
+        "min_seconds": round(min(seconds), 6),
+        "peak_rss_mb": round(max(peaks) / 2**20, 1),
+    }
+    if payload:
+        record["payload_bytes"] = payload(result)
+    return record
+
+
+def _figure_bytes(graph):
+    figure = getattr(graph, "figure", None)
+    return len(figure.to_json()) if figure is not None else 0
+
+
+def bench_dataset(shape, n_rows, fmt, repeat):
+    value = generate(shape, n_rows, fmt)
+    path = resolve_dataset_path(value)
+    stages = {}
+
+    def ready():
+        # Sidecars exist as after an upload; only the in-memory caches start empty.
+        _clear_memory_caches()
+        if not has_fresh_columnar(path):
+            prepare_dataset(value)
+
+    stages["parse_source"] = _run_stage(lambda: _parse_source(path), _clear_memory_caches, repeat)
+    stages["prepare_dataset"] = _run_stage(lambda: prepare_dataset(value), lambda: _cold_start(value), repeat)
+    stages["load_dataset_cold"] = _run_stage(lambda: load_dataset(value), ready, repeat)
+    stages["load_dataset_warm"] = _run_stage(lambda: load_dataset(value), repeat=repeat)
+    stages["load_projection"] = _run_stage(lambda: load_dataset(value, columns=["value", "region"]), ready, repeat)
+
+    df = load_dataset(value)
+    stages["build_summary"] = _run_stage(lambda: build_summary(df), repeat=repeat, payload=_json_bytes)
+    stages["detect_numeric_columns"] = _run_stage(lambda: detect_numeric_columns(df), repeat=repeat)
+    metric = "metric_00" if "metric_00" in df.columns else "quantity"
+    charts = {
+        chart: (builder, x, metric if y == "metric" else y, color)
+        for chart, (builder, x, y, color) in CHARTS.items()
+    }
+    for chart, (builder, x, y, color) in charts.items():
+        columns = (x, color) if chart == "histogram" else (x, y, color)
+        stages[f"build_{chart}"] = _run_stage(
+            lambda: builder(df, *columns, color_value="#4C78A8"), repeat=repeat, payload=_figure_bytes
+        )
+
+    def render(view_type, chart_type=None, x=None, y=None, color=None):
+        return lambda: app._render_view(value, view_type, chart_type, x, y, color, "#4C78A8", "primary", "light")
+
+    stages["render_table"] = _run_stage(render("table"), ready, repeat, _json_bytes)
+    stages["render_summary"] = _run_stage(render("summary"), ready, repeat, _json_bytes)
+    for chart, (_, x, y, color) in charts.items():
+        view = render("chart", chart, x, y, color)
+        stages[f"render_{chart}_cold"] = _run_stage(view, ready, repeat, _json_bytes)
+        stages[f"render_{chart}_warm"] = _run_stage(view, repeat=repeat)
+
+    memory = load_summary(value).get("memory")
+    return {
+        "dataset": dataset_name(shape, n_rows, fmt),
+        "shape": shape,
+        "rows": n_rows,
+        "columns": len(df.columns),
+        "format": fmt,
+        "file_mb": round(path.stat().st_size / 2**20, 1),
+        "default_mb": round(memory["default_bytes"] / 2**20, 1) if memory else None,
+        "typed_mb": round(memory["typed_bytes"] / 2**20, 1) if memory else None,
+        "stages": stages,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_dataset(result, baseline=None):
+    print(f"\n{result['dataset']}  ({result['rows']:,} rows x {result['columns']} columns, {result['file_mb']} MB)")
+    if result.get("typed_mb") is not None:
+        print(f"  columns in memory: {result['typed_mb']} MB typed vs {result['default_mb']} MB default inference")
+    base_stages = (baseline or {}).get("stages", {})
+    for stage, record in result["stages"].items():
+        line = f"  {stage:<24}{record['seconds'] * 1000:10.1f} ms{record['peak_rss_mb']:9.1f} MB"
+        if "payload_bytes" in record:
+            line += f"{record['payload_bytes'] / 1024:10.1f} KB"
+        if stage in base_stages and base_stages[stage]["seconds"]:
+            line += f"   x{record['seconds'] / base_stages[stage]['seconds']:.2f} vs baseline"
+        print(line)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10k,100k", help="comma-separated row counts, e.g. 10k,1m,10m")
+    parser.add_argument("--shapes", default="narrow,wide", help=f"comma-separated subset of {','.join(SHAPES)}")
+    parser.add_argument("--formats", default="csv", help="comma-separated subset of csv,xlsx")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (median is reported)")
+    parser.add_argument("--out", type=Path, help="result file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare latencies against")
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    started = datetime.now(timezone.utc)
+    baseline = {}
+    if args.compare:
+        baseline = {item["dataset"]: item for item in json.loads(args.compare.read_text())["results"]}
+
+    results = []
+    for fmt in args.formats.split(","):
+        for shape in args.shapes.split(","):
+            for n_rows in map(parse_rows, args.rows.split(",")):
+                if fmt == "xlsx" and n_rows > XLSX_MAX_ROWS:
+                    print(f"\nskipping {dataset_name(shape, n_rows, fmt)}: more rows than an Excel sheet holds")
+                    continue
+                result = bench_dataset(shape, n_rows, fmt, args.repeat)
+                _print_dataset(result, baseline.get(result["dataset"]))
+                results.append(result)
+
+    out = args.out or RESULTS_DIR / f"{started:%Y%m%dT%H%M%S}-{commit or 'nogit'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "timestamp": started.isoformat(),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "platform": platform.platform(),
+                "cpu_count": psutil.cpu_count(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"\nresults written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,14 @@
 from dash import dcc, html
 
 
+def pane_id(kind, pane):
+    return {"type": kind, "pane": pane}
+
+
+def filter_id(kind, row):
+    return {"type": kind, "row": row}
+
+
 def upload_component(id="upload-data"):
     return dcc.Upload(
         id=id,
@@ -13,6 +21,36 @@ def upload_component(id="upload-data"):
     )
 
 
+def chunked_upload_component(id="chunked-upload"):
+    return html.Div(
+        className="upload-box chunked-upload",
+        children=[
+            html.Span("Large CSV? "),
+            html.Button("Stream it in chunks", id=f"{id}-button", className="chunked-upload-button"),
+            html.Div(id=f"{id}-status", className="status-text"),
+            dcc.Store(id=f"{id}-result"),
+        ],
+    )
+
+
+def pane_content(pane):
+    """The content area of one view pane plus the store that hands slow renders to a background job."""
+    return html.Div([html.Div(id=pane_id("pane-content", pane)), dcc.Store(id=pane_id("render-job", pane))])
+
+
+def render_progress(id="render-progress"):
+    return html.Div(
+        id=id,
+        className="render-progress",
+        style={"display": "none"},
+        children=[
+            html.Progress(id=f"{id}-bar", value="0", max="3"),
+            html.Span(id=f"{id}-label", className="status-text"),
+            html.Button("Cancel", id=f"{id}-cancel", className="chunked-upload-button"),
+        ],
+    )
+
+
 def dataset_dropdown(id="dataset-dropdown", options=None, value=None):
     return dcc.Dropdown(
         id=id,
@@ -80,10 +118,18 @@ def color_picker(id="color-picker", value="#4C78A8"):
     return dcc.Input(id=id, type="color", value=value, debounce=True, style={"width": "100%"})
 
 
-def comparison_toggle(id="comparison-toggle"):
-    return dcc.Checklist(
+def pane_count_radio(id="pane-count", max_panes=2, value=1):
+    return dcc.RadioItems(
         id=id,
-        options=[{"label": "Add comparison view", "value": "enabled"}],
-        value=[],
+        options=[{"label": str(count), "value": count} for count in range(1, max_panes + 1)],
+        value=value,
         inline=True,
     )
+
+
+def range_input(id, placeholder):
+    return dcc.Input(id=id, type="text", debounce=True, placeholder=placeholder, className="range-input")
+
+
+def category_dropdown(id, options=None, value=None):
+    return dcc.Dropdown(id=id, options=options or [], value=value or [], multi=True, placeholder="Any value")
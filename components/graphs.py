@@ -1,6 +1,41 @@
-import plotly.express as px
+import os
+
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
 from dash import dcc, html
 
+from utils.aggregation import bar_totals, box_stats, histogram_bins, line_series, value_column
+from utils.downsample import MAX_POINTS, clip_to_range, downsample_frame
+from utils.metrics import timed
+
+WEBGL_THRESHOLD = int(os.environ.get("DASH_BORED_WEBGL_THRESHOLD", "2000"))
+
+THEME_LAYOUTS = {
+    "light": {
+        "paper_bgcolor": "white",
+        "plot_bgcolor": "#E5ECF6",
+        "font": {"color": "#2a3f5f"},
+        "xaxis": {"gridcolor": "white"},
+        "yaxis": {"gridcolor": "white"},
+    },
+    "dark": {
+        "paper_bgcolor": "rgba(0, 0, 0, 0)",
+        "plot_bgcolor": "#1f2233",
+        "font": {"color": "#f1f3f5"},
+        "xaxis": {"gridcolor": "#3a3f5c"},
+        "yaxis": {"gridcolor": "#3a3f5c"},
+    },
+}
+
+
+def _express():
+    # plotly.express is the slowest import in the app; load it with the first
+    # chart instead of at startup.
+    import plotly.express as px
+
+    return px
+
 
 def _missing_columns_message():
     return html.Div("Please select valid columns to build this chart.")
@@ -15,78 +50,192 @@ def _color_kwargs(color_column, color_value):
     return kwargs
 
 
-def build_histogram(df, x_column, color_column=None, color_value=None):
+def _use_webgl(n_points):
+    return 0 < WEBGL_THRESHOLD <= n_points
+
+
+def theme_layout(theme):
+    return THEME_LAYOUTS.get(theme, THEME_LAYOUTS["light"])
+
+
+def base_color_layout(color_value):
+    return {"colorway": [color_value]}
+
+
+def _use_layout_colors(fig, color_value):
+    """Move the base color from each trace onto ``layout.colorway``.
+
+    Traces without an explicit color follow the colorway, so a later color
+    change can be sent as a one-key layout patch instead of a new figure.
+    """
+    if not color_value:
+        return
+    fig.update_layout(**base_color_layout(color_value))
+    for trace in fig.data:
+        if "marker" in trace:
+            trace.marker.color = None
+        if "line" in trace:
+            trace.line.color = None
+
+
+def _graph(fig, graph_id=None, color_value=None):
+    _use_layout_colors(fig, color_value)
+    if graph_id is None:
+        return dcc.Graph(figure=fig)
+    return dcc.Graph(id=graph_id, figure=fig)
+
+
+def _finish_sampled(fig, shown, total, x_range):
+    if x_range:
+        fig.update_xaxes(range=x_range, autorange=False)
+    if shown < total:
+        fig.add_annotation(
+            text=f"Showing {shown:,} of {total:,} points ({total - shown:,} hidden). Zoom in for more detail.",
+            xref="paper",
+            yref="paper",
+            x=1,
+            y=1.06,
+            xanchor="right",
+            showarrow=False,
+            font={"size": 11},
+        )
+    fig.update_layout(uirevision="chart")
+
+
+@timed("render")
+def build_histogram(df, x_column, color_column=None, color_value=None, graph_id=None):
     if not x_column or x_column not in df.columns:
         return _missing_columns_message()
-    fig = px.histogram(
-        df, x=x_column, title=f"Histogram of {x_column}", **_color_kwargs(color_column, color_value)
+    bins = histogram_bins(df, x_column, color_column)
+    fig = _express().bar(
+        bins,
+        x=x_column,
+        y="count",
+        title=f"Histogram of {x_column}",
+        **_color_kwargs(color_column, color_value),
     )
-    return dcc.Graph(figure=fig)
+    if "width" in bins.columns and not bins.empty:
+        fig.update_traces(width=bins["width"].iloc[0])
+    return _graph(fig, graph_id, color_value)
 
 
-def build_bar(df, x_column, y_column, color_column=None, color_value=None):
+@timed("render")
+def build_bar(df, x_column, y_column, color_column=None, color_value=None, graph_id=None):
     if not x_column or not y_column or x_column not in df.columns or y_column not in df.columns:
         return _missing_columns_message()
-    fig = px.bar(
-        df,
+    totals = bar_totals(df, x_column, y_column, color_column)
+    fig = _express().bar(
+        totals,
         x=x_column,
-        y=y_column,
+        y=value_column(y_column, "sum", x_column, color_column),
         title=f"Bar chart of {y_column} by {x_column}",
         **_color_kwargs(color_column, color_value),
     )
-    return dcc.Graph(figure=fig)
+    if "width" in totals.columns and not totals.empty:
+        fig.update_traces(width=totals["width"].iloc[0])
+    return _graph(fig, graph_id, color_value)
 
 
-def build_scatter(df, x_column, y_column, color_column=None, color_value=None):
+@timed("render")
+def build_scatter(df, x_column, y_column, color_column=None, color_value=None, x_range=None, graph_id=None):
     if not x_column or not y_column or x_column not in df.columns or y_column not in df.columns:
         return _missing_columns_message()
-    fig = px.scatter(
-        df,
+    window = clip_to_range(df, x_column, x_range)
+    points, total = downsample_frame(window, x_column, y_column, color_column, MAX_POINTS, method="grid")
+    webgl = _use_webgl(len(points))
+    fig = _express().scatter(
+        points,
         x=x_column,
         y=y_column,
         title=f"Scatter plot of {y_column} vs {x_column}",
+        render_mode="webgl" if webgl else "auto",
         **_color_kwargs(color_column, color_value),
     )
-    fig.update_traces(marker={"size": 10})
-    return dcc.Graph(figure=fig)
+    if webgl:
+        fig.update_traces(marker={"size": 4, "opacity": 0.7, "line": {"width": 0}})
+    else:
+        fig.update_traces(marker={"size": 10})
+    _finish_sampled(fig, len(points), total, x_range)
+    return _graph(fig, graph_id, color_value)
 
 
-def build_line(df, x_column, y_column, color_column=None, color_value=None):
+@timed("render")
+def build_line(df, x_column, y_column, color_column=None, color_value=None, x_range=None, graph_id=None):
     if not x_column or not y_column or x_column not in df.columns or y_column not in df.columns:
         return _missing_columns_message()
-    fig = px.line(
-        df,
+    series = line_series(clip_to_range(df, x_column, x_range), x_column, y_column, color_column)
+    mean = value_column(y_column, "mean", x_column, color_column)
+    points, total = downsample_frame(series, x_column, mean, color_column, MAX_POINTS, method="lttb")
+    webgl = _use_webgl(len(points))
+    fig = _express().line(
+        points,
         x=x_column,
-        y=y_column,
-        markers=True,
+        y=mean,
+        markers=not webgl,
+        render_mode="webgl" if webgl else "auto",
         title=f"Line chart of {y_column} over {x_column}",
         **_color_kwargs(color_column, color_value),
     )
-    return dcc.Graph(figure=fig)
+    _finish_sampled(fig, len(points), total, x_range)
+    return _graph(fig, graph_id, color_value)
 
 
-def build_area(df, x_column, y_column, color_column=None, color_value=None):
+@timed("render")
+def build_area(df, x_column, y_column, color_column=None, color_value=None, x_range=None, graph_id=None):
     if not x_column or not y_column or x_column not in df.columns or y_column not in df.columns:
         return _missing_columns_message()
-    fig = px.area(
-        df,
+    ordered = clip_to_range(df, x_column, x_range).sort_values(x_column, kind="stable")
+    points, total = downsample_frame(ordered, x_column, y_column, color_column, MAX_POINTS, method="lttb")
+    fig = _express().area(
+        points,
         x=x_column,
         y=y_column,
         title=f"Area chart of {y_column} over {x_column}",
         **_color_kwargs(color_column, color_value),
     )
-    return dcc.Graph(figure=fig)
+    _finish_sampled(fig, len(points), total, x_range)
+    return _graph(fig, graph_id, color_value)
 
 
-def build_box(df, x_column, y_column, color_column=None, color_value=None):
+@timed("render")
+def build_box(df, x_column, y_column, color_column=None, color_value=None, graph_id=None):
     if not x_column or x_column not in df.columns or (y_column and y_column not in df.columns):
         return _missing_columns_message()
-    fig = px.box(
-        df,
-        x=x_column,
-        y=y_column,
-        points="all",
-        title="Box plot",
-        **_color_kwargs(color_column, color_value),
+    # A column against itself is one box of its values, like a box of x alone.
+    if y_column == x_column:
+        y_column = None
+    if y_column:
+        boxes = box_stats(df, y_column, x_column, color_column)
+    elif pd.api.types.is_numeric_dtype(df[x_column]):
+        boxes = box_stats(df, x_column, None, color_column)
+    else:
+        return _missing_columns_message()
+
+    fig = go.Figure(layout={"title": {"text": "Box plot"}, "boxmode": "group"})
+    palette = qualitative.Plotly
+    for index, box in enumerate(boxes):
+        name = str(box["name"]) if box["name"] is not None else y_column or x_column
+        marker = {"color": color_value or palette[index % len(palette)]}
+        stats = {key: box[key] for key in ("q1", "median", "q3", "lowerfence", "upperfence", "mean")}
+        if y_column:
+            fig.add_trace(go.Box(x=box["category"], name=name, legendgroup=name, marker=marker, **stats))
+            outlier_xy = {"x": box["outlier_category"], "y": box["outlier_value"]}
+        else:
+            fig.add_trace(go.Box(y=[name], orientation="h", name=name, legendgroup=name, marker=marker, **stats))
+            outlier_xy = {"x": box["outlier_value"], "y": [name] * len(box["outlier_value"])}
+        fig.add_trace(
+            go.Scatter(
+                mode="markers",
+                name=name,
+                legendgroup=name,
+                showlegend=False,
+                marker={"size": 4, **marker},
+                **outlier_xy,
+            )
+        )
+    fig.update_layout(
+        xaxis_title=x_column,
+        yaxis_title=y_column,
+        showlegend=bool(color_column),
     )
-    return dcc.Graph(figure=fig)
+    return _graph(fig, graph_id, color_value)
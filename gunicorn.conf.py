@@ -0,0 +1,35 @@
+"""Production settings for serving the dashboard with gunicorn.
+
+Run with ``gunicorn app:server`` from the project root; gunicorn picks this
+file up automatically. ``SIGHUP`` to the master process replaces the workers
+gracefully, but with ``preload_app`` they are forked from the app the master
+imported at startup, so code changes are not picked up. To deploy new code,
+send ``SIGUSR2`` (a new master starts with the current code) and then
+``SIGQUIT`` to the old master, or restart gunicorn. With
+``DASH_BORED_PRELOAD=0`` each worker imports the app itself and ``SIGHUP``
+loads the current code.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("DASH_BORED_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("DASH_BORED_WORKERS", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+worker_class = "gthread"
+threads = int(os.environ.get("DASH_BORED_THREADS", "4"))
+
+# Import the app (Dash, pandas, plotly, pyarrow) once in the master so workers
+# share those pages via fork instead of each importing them.
+preload_app = os.environ.get("DASH_BORED_PRELOAD", "1") != "0"
+
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically so memory from one-off large renders is returned.
+max_requests = 1000
+max_requests_jitter = 100
+
+accesslog = "-"
+errorlog = "-"
+
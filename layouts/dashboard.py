@@ -0,0 +1,156 @@
+import os
+
+from dash import dcc, html
+from components.controls import (
+    category_dropdown,
+    dataset_dropdown,
+    view_type_radio,
+    theme_toggle,
+    chart_type_radio,
+    axis_dropdown,
+    color_picker,
+    filter_id,
+    pane_count_radio,
+    pane_content,
+    pane_id,
+    range_input,
+    render_progress,
+)
+from utils.filters import FILTER_ROWS
+
+
+VIEW_CONTAINER_ID = "view-container"
+MAX_PANES = max(int(os.environ.get("DASH_BORED_MAX_PANES", "6")), 1)
+PANES = ["primary", *(f"comparison-{index}" for index in range(1, MAX_PANES))]
+PANE_COLORS = ["#4C78A8", "#b95c70", "#54a24b", "#f58518", "#72b7b2", "#b279a2"]
+COMPARISON_CHARTS = ["scatter", "bar", "line", "box", "area", "histogram"]
+
+
+def pane_title(index):
+    return "Primary View" if index == 0 else f"View {index + 1}"
+
+
+def _pane_controls(index, pane):
+    if index == 0:
+        view, chart = "table", "histogram"
+    else:
+        view, chart = "chart", COMPARISON_CHARTS[(index - 1) % len(COMPARISON_CHARTS)]
+    return html.Div(
+        id=pane_id("pane-controls", pane),
+        className="controls-row",
+        style=None if index == 0 else {"display": "none"},
+        children=[
+            html.Div(
+                className="control-card",
+                children=[html.Strong(pane_title(index)), view_type_radio(pane_id("view-type", pane), value=view)],
+            ),
+            html.Div(
+                className="control-card",
+                children=[html.Strong("Chart Type"), chart_type_radio(pane_id("chart-type", pane), value=chart)],
+            ),
+            html.Div(
+                className="control-card",
+                children=[html.Strong("X Axis"), axis_dropdown(pane_id("x-axis", pane))],
+            ),
+            html.Div(
+                className="control-card",
+                children=[html.Strong("Y Axis"), axis_dropdown(pane_id("y-axis", pane))],
+            ),
+            html.Div(
+                className="control-card",
+                children=[
+                    html.Strong("Color By"),
+                    axis_dropdown(pane_id("color-column", pane), placeholder="Optional"),
+                ],
+            ),
+            html.Div(
+                className="control-card narrow-card",
+                children=[
+                    html.Strong("Base Color"),
+                    color_picker(pane_id("color-picker", pane), PANE_COLORS[index % len(PANE_COLORS)]),
+                ],
+            ),
+        ],
+    )
+
+
+def _filter_controls():
+    return html.Div(
+        className="controls-row",
+        children=[
+            *(
+                html.Div(
+                    className="control-card",
+                    children=[
+                        html.Strong(f"Filter {row + 1}"),
+                        axis_dropdown(filter_id("filter-column", row), placeholder="Column"),
+                        html.Div(
+                            id=filter_id("filter-range", row),
+                            className="filter-range",
+                            children=[
+                                range_input(filter_id("filter-min", row), "Min"),
+                                range_input(filter_id("filter-max", row), "Max"),
+                            ],
+                        ),
+                        html.Div(
+                            id=filter_id("filter-categories", row),
+                            style={"display": "none"},
+                            children=category_dropdown(filter_id("filter-values", row)),
+                        ),
+                    ],
+                )
+                for row in range(FILTER_ROWS)
+            ),
+            html.Div(id="filter-status", className="status-text"),
+            dcc.Store(id="filter-spec", data=[]),
+        ],
+    )
+
+
+def dashboard_controls(dataset_value, dataset_options):
+    """The dataset, theme and view-count row, the row filters, then one controls row per pane."""
+    return html.Div(
+        children=[
+            html.Div(
+                className="controls-row",
+                children=[
+                    html.Div(
+                        className="control-card",
+                        children=[
+                            html.Strong("Dataset"),
+                            dataset_dropdown(value=dataset_value, options=dataset_options),
+                        ],
+                    ),
+                    html.Div(className="control-card", children=[html.Strong("Theme"), theme_toggle()]),
+                    html.Div(
+                        className="control-card",
+                        children=[html.Strong("Views"), pane_count_radio(max_panes=MAX_PANES)],
+                    ),
+                ],
+            ),
+            _filter_controls(),
+            *(_pane_controls(index, pane) for index, pane in enumerate(PANES)),
+        ]
+    )
+
+
+def pane_grid():
+    """The progress bar and a card per pane; cards past the selected view count are hidden."""
+    return html.Div(
+        children=[
+            render_progress(),
+            html.Div(
+                id=VIEW_CONTAINER_ID,
+                className="view-single",
+                children=[
+                    html.Div(
+                        id=pane_id("pane-card", pane),
+                        className="view-card",
+                        style=None if index == 0 else {"display": "none"},
+                        children=[html.H3(pane_title(index)), pane_content(pane)],
+                    )
+                    for index, pane in enumerate(PANES)
+                ],
+            ),
+        ]
+    )
@@ -13,7 +13,7 @@ PORT = 8050
 
 
 def _run_server():
-    app.run_server(host="0.0.0.0", port=PORT, debug=False)
+    app.run(host="0.0.0.0", port=PORT, debug=False)
 
 
 def main():
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from utils.aggregation import MAX_BARS, OTHER_LABEL, bar_totals, box_stats, histogram_bins, line_series, value_column
+
+
+def _sales(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "sales": rng.integers(1, 20, n).astype(float),
+        "region": rng.choice(["north", "south", "east"], n),
+        "id": [f"id-{i}" for i in range(n)],
+    })
+
+
+def test_bar_and_line_of_a_column_against_itself():
+    df = _sales()
+    totals = bar_totals(df, "sales", "sales")
+    assert value_column("sales", "sum", "sales") == "sum of sales"
+    assert totals.set_index("sales")["sum of sales"].to_dict() == df.groupby("sales")["sales"].sum().to_dict()
+    means = line_series(df, "sales", "sales")
+    assert (means["sales"] == means["mean of sales"]).all()
+
+
+def test_color_by_x_and_folded_bars():
+    df = _sales()
+    assert len(bar_totals(df, "region", "sales", "region")) == 3
+    assert len(histogram_bins(df, "region", "region")) == 3
+    folded = bar_totals(df, "id", "sales", "id")
+    assert len(folded) == MAX_BARS and OTHER_LABEL in folded["id"].tolist()
+    assert folded["sales"].sum() == df["sales"].sum()
+    assert len(line_series(df, "sales", "sales", "sales")) == df["sales"].nunique()
+
+
+def test_many_categories_are_folded_into_other():
+    df = _sales(n=5000)
+    counts = histogram_bins(df, "id")
+    assert len(counts) == MAX_BARS and counts["count"].sum() == len(df)
+    (box,) = box_stats(df, "sales", "id")
+    assert len(box["category"]) == MAX_BARS and OTHER_LABEL in box["category"]
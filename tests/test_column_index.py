@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from utils.column_index import build_column_index, has_fresh_index, load_column_index
+from utils.columnar import write_columnar
+from utils.filters import _predicate_mask
+
+
+def _dataset(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 1500
+    df = pd.DataFrame({
+        "value": np.where(rng.random(n) < 0.1, np.nan, rng.normal(size=n)),
+        "count": rng.integers(0, 50, n).astype("int8"),
+        "when": pd.Series(pd.date_range("2024-01-01", periods=n, freq="h", tz="Europe/Berlin")).where(
+            rng.random(n) > 0.05
+        ),
+        "region": pd.Categorical(rng.choice(["north", "south", "east"], n)),
+        "flag": rng.random(n) < 0.5,
+        "id": [f"row-{i}" for i in range(n)],
+    })
+    dataset_path = tmp_path / "data.csv"
+    dataset_path.write_text("placeholder")
+    write_columnar(df, dataset_path)
+    return dataset_path, df
+
+
+def test_index_masks_match_column_scans(tmp_path):
+    dataset_path, df = _dataset(tmp_path)
+    build_column_index(dataset_path)
+    assert has_fresh_index(dataset_path)
+    index = load_column_index(dataset_path, "v1")
+    predicates = [
+        {"column": "value", "range": [-0.5, 0.5]},
+        {"column": "value", "range": [None, 0.0]},
+        {"column": "count", "range": [10.5, 20.0]},
+        {"column": "when", "range": ["2024-01-10T00:00:00", "2024-01-20T12:00:00"]},
+        {"column": "region", "values": ["east", "west"]},
+        {"column": "flag", "values": [True]},
+    ]
+    for predicate in predicates:
+        expected = _predicate_mask(df[predicate["column"]], predicate)
+        assert index.mask(predicate).tolist() == expected.tolist(), predicate
+    # Too many distinct values to index: the caller falls back to scanning.
+    assert index.mask({"column": "id", "values": ["row-1"]}) is None
+    assert index.mask({"column": "region", "range": [1.0, None]}) is None
+
+
+def test_rebuilt_index_replaces_the_old_one(tmp_path):
+    dataset_path, df = _dataset(tmp_path)
+    build_column_index(dataset_path)
+    write_columnar(df.head(10), dataset_path)
+    build_column_index(dataset_path)
+    index = load_column_index(dataset_path, "v2")
+    assert index.n_rows == 10
+    assert index.mask({"column": "flag", "values": [True]}).tolist() == df["flag"].head(10).tolist()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from utils.aggregation import box_stats
+from utils.downsample import downsample_frame, grid_thin_indices, lttb_indices
+
+
+def _frame(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "x": np.arange(n, dtype=float),
+        "y": rng.normal(size=n),
+        "group": rng.choice(["a", "b", "c"], n),
+    })
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 20)
+    selected = lttb_indices(x, y, 100)
+    assert len(selected) == 100
+    assert selected[0] == 0 and selected[-1] == 999
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_lttb_and_grid_handle_empty_and_small_inputs():
+    empty = np.array([], dtype=float)
+    assert len(lttb_indices(empty, empty, 100)) == 0
+    assert len(grid_thin_indices(empty, empty, 100)) == 0
+    small = np.arange(5, dtype=float)
+    assert list(lttb_indices(small, small, 100)) == [0, 1, 2, 3, 4]
+
+
+def test_grid_thinning_stays_within_budget():
+    df = _frame()
+    selected = grid_thin_indices(df["x"].to_numpy(), df["y"].to_numpy(), 500)
+    assert 0 < len(selected) <= 500
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_downsample_frame_all_nan_column():
+    df = _frame().assign(y=np.nan)
+    for method in ("lttb", "grid"):
+        points, total = downsample_frame(df, "x", "y", max_points=1000, method=method)
+        assert points.empty
+        assert total == len(df)
+
+
+def test_downsample_frame_grouped_shares_budget():
+    df = _frame()
+    points, total = downsample_frame(df, "x", "y", "group", max_points=900)
+    assert total == len(df)
+    assert len(points) <= 900 + 3
+    assert set(points["group"]) == {"a", "b", "c"}
+
+
+def test_box_stats_empty_all_nan_and_grouped():
+    df = _frame(1000)
+    assert box_stats(df.iloc[:0], "y", "group") == []
+    assert box_stats(df.assign(y=np.nan), "y", "group") == []
+
+    boxes = box_stats(df, "y", "group")
+    assert len(boxes) == 1
+    box = boxes[0]
+    assert box["category"] == ["a", "b", "c"]
+    for q1, median, q3 in zip(box["q1"], box["median"], box["q3"]):
+        assert q1 <= median <= q3
+
+    colored = box_stats(df, "y", color_column="group")
+    assert sorted(box["name"] for box in colored) == ["a", "b", "c"]
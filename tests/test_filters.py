@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from utils.filters import filter_key, filter_rows, mask_cache, normalize_filter
+
+SCHEMA = {
+    "dtypes": {"value": "float64", "when": "datetime64[ns]", "region": "category", "flag": "bool"},
+    "numeric": ["value", "flag"],
+}
+
+
+def _frame():
+    return pd.DataFrame({
+        "value": [1.0, 5.0, np.nan, 10.0],
+        "when": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01", None]),
+        "region": pd.Categorical(["a", "b", "a", "c"]),
+        "flag": [True, False, True, False],
+    })
+
+
+def test_normalize_filter_picks_range_or_values():
+    assert normalize_filter(SCHEMA, "value", "2", "") == {"column": "value", "range": [2.0, None]}
+    assert normalize_filter(SCHEMA, "when", "2024-01-15", None) == {
+        "column": "when",
+        "range": ["2024-01-15T00:00:00", None],
+    }
+    assert normalize_filter(SCHEMA, "region", values=["b", "a"]) == {"column": "region", "values": ["a", "b"]}
+    assert normalize_filter(SCHEMA, "flag", values=[True]) == {"column": "flag", "values": [True]}
+    assert normalize_filter(SCHEMA, "value", "not a number", None) is None
+    assert normalize_filter(SCHEMA, "region") is None
+    assert normalize_filter(SCHEMA, "missing", "1", "2") is None
+
+
+def test_filter_rows_combines_predicates_and_drops_missing_values():
+    df = _frame()
+    filters = [
+        normalize_filter(SCHEMA, "value", "2", None),
+        normalize_filter(SCHEMA, "region", values=["b", "c"]),
+    ]
+    mask = filter_rows(df, "frame", 1, filters)
+    assert mask.tolist() == [False, True, False, True]
+    dates = filter_rows(df, "frame", 1, [normalize_filter(SCHEMA, "when", None, "2024-02-01")])
+    assert dates.tolist() == [True, True, False, False]
+
+
+def test_filter_rows_reuses_column_masks():
+    mask_cache.clear()
+    df = _frame()
+    value_filter = normalize_filter(SCHEMA, "value", None, "5")
+    filter_rows(df, "reuse", 1, [value_filter])
+    hits = mask_cache.hits
+    filter_rows(df, "reuse", 1, [value_filter, normalize_filter(SCHEMA, "flag", values=[True])])
+    assert mask_cache.hits == hits + 1
+    # A new dataset version recomputes instead of reusing a stale mask.
+    filter_rows(df, "reuse", 2, [value_filter])
+    assert mask_cache.hits == hits + 1
+
+
+def test_filter_key_ignores_order():
+    a = {"column": "value", "range": [1.0, None]}
+    b = {"column": "region", "values": ["a"]}
+    assert filter_key([a, b]) == filter_key([b, a])
+    assert filter_key([]) == ""
@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+
+from utils.metrics import timed
+
+MAX_BINS = 200
+MAX_BOX_OUTLIERS = 2000
+MAX_BARS = 50
+OTHER_LABEL = "Other"
+
+
+def _group_columns(*columns) -> list:
+    return [col for col in dict.fromkeys(columns) if col]
+
+
+def value_column(name, how, *keys):
+    """The result column for ``how`` of ``name``, renamed when a group key has the same name.
+
+    Charting a column against itself (``x == y``) is the default selection,
+    and its totals cannot go in a column the group key already occupies.
+    """
+    return f"{how} of {name}" if name in keys else name
+
+
+def _fold_rare(series: pd.Series, ranking: pd.Series) -> pd.Series:
+    """Keep the ``MAX_BARS - 1`` values ranked highest by ``ranking``; label the rest ``OTHER_LABEL``."""
+    top = ranking.nlargest(MAX_BARS - 1).index
+    keep = series.isin(top) | series.isna()
+    return series.astype(object).where(keep, OTHER_LABEL)
+
+
+def _is_binnable(series: pd.Series) -> bool:
+    if pd.api.types.is_bool_dtype(series):
+        return False
+    return pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
+
+
+def _bins(series: pd.Series):
+    """Split a numeric or datetime series into shared equal-width bins.
+
+    Returns the mask of non-missing rows, the bin of each of those rows, the
+    bin centers (as timestamps for datetimes) and the bar width in axis units.
+    """
+    is_datetime = pd.api.types.is_datetime64_any_dtype(series)
+    valid = series.notna().to_numpy()
+    values = series[valid].to_numpy(dtype="datetime64[ns]" if is_datetime else None)
+    values = values.astype("int64" if is_datetime else "float64")
+    if not len(values):
+        return valid, values.astype("int64"), values, 0.0
+
+    edges = np.histogram_bin_edges(values, bins="auto")
+    if len(edges) - 1 > MAX_BINS:
+        edges = np.linspace(values.min(), values.max(), MAX_BINS + 1)
+    bin_index = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+    centers = (edges[:-1] + edges[1:]) / 2
+    width = float(edges[1] - edges[0])
+    if is_datetime:
+        centers = pd.to_datetime(centers.astype("int64"))
+        width = width / 1e6
+    return valid, bin_index, np.asarray(centers), width
+
+
+def _binned(df, valid, bin_index, group_cols, summed=None, total=None):
+    """Count rows (or sum column ``summed`` into column ``total``) per bin and group."""
+    frame = pd.DataFrame({"bin": bin_index})
+    for col in _group_columns(*group_cols, summed):
+        frame[col] = df.loc[valid, col].to_numpy()
+    grouped = frame.groupby(group_cols + ["bin"], observed=True, sort=True)
+    if summed is None:
+        return grouped.size().reset_index(name="count")
+    return grouped[summed].sum().rename(total).reset_index()
+
+
+@timed("transform")
+def histogram_bins(df: pd.DataFrame, x_column, color_column=None) -> pd.DataFrame:
+    """Count rows per histogram bin (and color group), one row per non-empty bar.
+
+    Numeric and datetime columns are split into shared equal-width bins; the
+    returned ``x_column`` holds bin centers and ``width`` the bar width in axis
+    units. Other columns are counted per distinct value, keeping the
+    ``MAX_BARS - 1`` most frequent and folding the rest into one
+    ``OTHER_LABEL`` bar.
+    """
+    # Coloring by x itself needs no extra group: the chart colors by the result's x column.
+    group_cols = _group_columns(color_column if color_column != x_column else None)
+    series = df[x_column]
+    if not _is_binnable(series):
+        labels = series
+        if series.nunique() > MAX_BARS:
+            labels = _fold_rare(series, series.value_counts()).rename(x_column)
+        grouped = df.groupby([labels, *(df[col] for col in group_cols)], observed=True, sort=False)
+        return grouped.size().reset_index(name="count")
+
+    valid, bin_index, centers, width = _bins(series)
+    if not len(bin_index):
+        return pd.DataFrame(columns=group_cols + [x_column, "count", "width"])
+    counts = _binned(df, valid, bin_index, group_cols)
+    counts[x_column] = centers[counts["bin"].to_numpy()]
+    counts["width"] = width
+    return counts.drop(columns="bin")
+
+
+@timed("transform")
+def bar_totals(df: pd.DataFrame, x_column, y_column, color_column=None) -> pd.DataFrame:
+    """Sum ``y_column`` per x (and color group) with at most ``MAX_BARS`` bars along x.
+
+    Numeric and datetime x with more distinct values are summed per
+    equal-width bin like ``histogram_bins``; other x keep the ``MAX_BARS - 1``
+    largest totals and fold the rest into one ``OTHER_LABEL`` bar. The sums
+    are in column ``value_column(y_column, "sum", x_column, color_column)``.
+    """
+    total = value_column(y_column, "sum", x_column, color_column)
+    group_cols = _group_columns(color_column if color_column != x_column else None)
+    keys = _group_columns(x_column, *group_cols)
+    series = df[x_column]
+    if series.nunique() <= MAX_BARS:
+        return df.groupby(keys, observed=True, sort=False)[y_column].sum().rename(total).reset_index()
+
+    if _is_binnable(series):
+        valid, bin_index, centers, width = _bins(series)
+        totals = _binned(df, valid, bin_index, group_cols, y_column, total)
+        totals[x_column] = centers[totals["bin"].to_numpy()]
+        totals["width"] = width
+        return totals.drop(columns="bin")
+
+    per_x = df.groupby(x_column, observed=True)[y_column].sum()
+    labels = _fold_rare(series, per_x.abs()).rename(x_column)
+    grouped = df.groupby([labels, *(df[col] for col in group_cols)], observed=True, sort=False)
+    return grouped[y_column].sum().rename(total).reset_index()
+
+
+@timed("transform")
+def line_series(df: pd.DataFrame, x_column, y_column, color_column=None) -> pd.DataFrame:
+    """Average ``y_column`` per distinct x (per color group), sorted along x.
+
+    The averages are in column ``value_column(y_column, "mean", x_column, color_column)``.
+    """
+    keys = _group_columns(color_column, x_column)
+    mean = value_column(y_column, "mean", x_column, color_column)
+    return df.groupby(keys, observed=True, sort=True)[y_column].mean().rename(mean).reset_index()
+
+
+@timed("transform")
+def box_stats(df: pd.DataFrame, value_column, category_column=None, color_column=None) -> list:
+    """Precompute Tukey box statistics per color group.
+
+    Returns one dict per color group with per-category arrays for ``q1``,
+    ``median``, ``q3``, ``lowerfence``, ``upperfence`` and ``mean``, plus a
+    capped sample of outlier points. Categories past the ``MAX_BARS - 1``
+    most frequent share one ``OTHER_LABEL`` box.
+    """
+    keys = _group_columns(category_column, color_column)
+    data = df[_group_columns(value_column, *keys)].dropna()
+    if data.empty:
+        return []
+    if category_column and data[category_column].nunique() > MAX_BARS:
+        categories = data[category_column]
+        # As text, so the kept values and OTHER_LABEL sort together.
+        folded = _fold_rare(categories, categories.value_counts()).astype(str)
+        data = data.copy()
+        data[category_column] = folded
+    if not keys:
+        data = data.assign(_group="")
+        keys = ["_group"]
+
+    grouped = data.groupby(keys, observed=True, sort=True)[value_column]
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ["q1", "median", "q3"]
+    stats["mean"] = grouped.mean()
+
+    iqr = stats["q3"] - stats["q1"]
+    bounds = pd.DataFrame({"low": stats["q1"] - 1.5 * iqr, "high": stats["q3"] + 1.5 * iqr})
+    row_index = pd.MultiIndex.from_frame(data[keys]) if len(keys) > 1 else pd.Index(data[keys[0]])
+    row_bounds = bounds.reindex(row_index)
+    values = data[value_column].to_numpy()
+    inside = (values >= row_bounds["low"].to_numpy()) & (values <= row_bounds["high"].to_numpy())
+
+    inliers = data.loc[inside].groupby(keys, observed=True, sort=True)[value_column]
+    stats["lowerfence"] = inliers.min()
+    stats["upperfence"] = inliers.max()
+    stats = stats.reset_index()
+
+    outliers = data.loc[~inside]
+    if len(outliers) > MAX_BOX_OUTLIERS:
+        outliers = outliers.sample(MAX_BOX_OUTLIERS, random_state=0)
+
+    if color_column:
+        outlier_groups = dict(list(outliers.groupby(color_column, observed=True, sort=False)))
+        groups = [
+            (name, group_stats, outlier_groups.get(name, outliers.iloc[:0]))
+            for name, group_stats in stats.groupby(color_column, observed=True, sort=False)
+        ]
+    else:
+        groups = [(None, stats, outliers)]
+
+    boxes = []
+    for name, group_stats, group_outliers in groups:
+        boxes.append({
+            "name": name,
+            "category": group_stats[category_column].tolist() if category_column else None,
+            "q1": group_stats["q1"].tolist(),
+            "median": group_stats["median"].tolist(),
+            "q3": group_stats["q3"].tolist(),
+            "lowerfence": group_stats["lowerfence"].tolist(),
+            "upperfence": group_stats["upperfence"].tolist(),
+            "mean": group_stats["mean"].tolist(),
+            "outlier_category": group_outliers[category_column].tolist() if category_column else None,
+            "outlier_value": group_outliers[value_column].tolist(),
+        })
+    return boxes
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import diskcache
+import psutil
+from dash import DiskcacheManager
+from dash.background_callback.managers import BaseBackgroundCallbackManager
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+JOBS_DIR = DATA_DIR / "cache" / "jobs"
+RESULT_TTL_SECONDS = int(os.environ.get("DASH_BORED_JOB_RESULT_TTL", "300"))
+CLAIM_EXPIRE_SECONDS = 600
+POLL_SECONDS = 0.05
+
+_job_cache = None
+
+
+def job_cache() -> diskcache.Cache:
+    """The shared job cache, opened on first use so importing the app touches no files."""
+    global _job_cache
+    if _job_cache is None:
+        _job_cache = diskcache.Cache(str(JOBS_DIR))
+    return _job_cache
+
+
+class _LazyDiskcacheManager(DiskcacheManager):
+    """A DiskcacheManager whose cache is ``job_cache()``, opened when the first job runs."""
+
+    def __init__(self):
+        # DiskcacheManager.__init__ wants an open cache; only the base setup is needed.
+        BaseBackgroundCallbackManager.__init__(self, None)
+        self.expire = None
+
+    @property
+    def handle(self):
+        return job_cache()
+
+    def make_job_fn(self, fn, progress, key=None):
+        # The base class binds the cache when the callback is registered; bind it when the job runs.
+        def job_fn(*args):
+            return super(_LazyDiskcacheManager, self).make_job_fn(fn, progress, key)(*args)
+
+        return job_fn
+
+
+background_callback_manager = _LazyDiskcacheManager()
+
+
+def _pid_alive(pid) -> bool:
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except (psutil.NoSuchProcess, TypeError, ValueError):
+        return False
+
+
+def job_key(*parts) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def finished_result(key: str):
+    """Return the published result of a finished job (see ``run_deduplicated``), or None."""
+    return job_cache().get(f"result:{key}")
+
+
+def run_deduplicated(key: str, compute):
+    """Run ``compute`` once for identical jobs that overlap in time.
+
+    The first job to claim ``key`` (see ``job_key``) does the work and
+    publishes its result to the shared job cache; identical jobs started
+    meanwhile wait for that result instead of repeating the work. A claim left behind by a cancelled (killed)
+    job is taken over by the next waiter.
+    """
+    cache = job_cache()
+    result_key, claim_key = f"result:{key}", f"claim:{key}"
+    while True:
+        result = cache.get(result_key, diskcache.ENOVAL)
+        if result is not diskcache.ENOVAL:
+            return result
+        if cache.add(claim_key, os.getpid(), expire=CLAIM_EXPIRE_SECONDS):
+            break
+        holder = cache.get(claim_key)
+        if holder is not None and not _pid_alive(holder):
+            cache.delete(claim_key)
+            continue
+        time.sleep(POLL_SECONDS)
+
+    try:
+        result = compute()
+        cache.set(result_key, result, expire=RESULT_TTL_SECONDS)
+        return result
+    finally:
+        cache.delete(claim_key)
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by the total size of its values, or by entry count.
+
+    Pass ``max_bytes`` and ``sizeof`` to bound by size, or ``max_entries`` to
+    keep at most that many entries. Each entry carries a ``version``; looking
+    a key up with a different version drops the stale entry, so callers can
+    key on a stable name and pass something like ``(mtime, size)`` to
+    invalidate on change.
+    """
+
+    def __init__(self, max_bytes=None, sizeof=None, max_entries=None):
+        if (max_bytes is None) == (max_entries is None):
+            raise ValueError("Pass exactly one of max_bytes or max_entries")
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._sizeof = sizeof or (lambda value: 0)
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __contains__(self, key):
+        """Whether ``key`` has an entry of any version, without counting a lookup."""
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry_version, value, nbytes = entry
+            if entry_version != version:
+                self._remove(key, nbytes)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, version=None):
+        nbytes = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, self._entries[key][2])
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return
+            self._entries[key] = (version, value, nbytes)
+            self._total_bytes += nbytes
+            while self._over_budget():
+                old_key, (_, _, old_bytes) = next(iter(self._entries.items()))
+                self._remove(old_key, old_bytes)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            budget = {"max_entries": self.max_entries}
+            if self.max_bytes is not None:
+                budget = {"bytes": self._total_bytes, "max_bytes": self.max_bytes}
+            return {
+                "entries": len(self._entries),
+                **budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _over_budget(self):
+        if self.max_entries is not None:
+            return len(self._entries) > self.max_entries
+        return self._total_bytes > self.max_bytes
+
+    def _remove(self, key, nbytes):
+        del self._entries[key]
+        self._total_bytes -= nbytes
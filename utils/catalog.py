@@ -0,0 +1,117 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CATALOG_PATH = DATA_DIR / "catalog.sqlite3"
+
+# Applied in order; PRAGMA user_version records how many have run.
+_MIGRATIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS uploads (
+        name TEXT PRIMARY KEY,
+        digest TEXT NOT NULL,
+        suffix TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        uploaded_at REAL NOT NULL
+    )
+    """,
+    """
+    ALTER TABLE uploads ADD COLUMN n_rows INTEGER;
+    ALTER TABLE uploads ADD COLUMN n_columns INTEGER;
+    ALTER TABLE uploads ADD COLUMN dtypes TEXT;
+    CREATE INDEX IF NOT EXISTS uploads_digest ON uploads (digest);
+    """,
+]
+
+_local = threading.local()
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(_MIGRATIONS):
+        return
+    # Take the write lock before reading the version, so workers starting
+    # together apply each migration once instead of racing on the same one.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for index, script in enumerate(_MIGRATIONS[version:], start=version + 1):
+            for statement in script.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {index}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _connection() -> sqlite3.Connection:
+    """Return this thread's catalog connection, reopening it after a fork."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.pid != os.getpid():
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(CATALOG_PATH, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        _migrate(conn)
+        _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+
+def register_upload(name: str, digest: str, suffix: str, size: int) -> None:
+    """Point ``name`` at the stored object with content hash ``digest``.
+
+    Row/column counts already known for the same content are carried over,
+    so a duplicate upload is listed with its size straight away.
+    """
+    conn = _connection()
+    with conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO uploads (name, digest, suffix, size, uploaded_at, n_rows, n_columns, dtypes)
+            SELECT :name, :digest, :suffix, :size, :uploaded_at, known.n_rows, known.n_columns, known.dtypes
+            FROM (SELECT 1) LEFT JOIN (
+                SELECT n_rows, n_columns, dtypes FROM uploads WHERE digest = :digest AND n_rows IS NOT NULL LIMIT 1
+            ) AS known
+            """,
+            {"name": name, "digest": digest, "suffix": suffix, "size": size, "uploaded_at": time.time()},
+        )
+
+
+def record_dataset_stats(name: str, n_rows: int, n_columns: int, dtypes: dict) -> None:
+    conn = _connection()
+    with conn:
+        conn.execute(
+            "UPDATE uploads SET n_rows = ?, n_columns = ?, dtypes = ? WHERE name = ?",
+            (n_rows, n_columns, json.dumps(dtypes), name),
+        )
+
+
+def lookup_upload(name: str):
+    """Return ``(digest, suffix)`` for an uploaded name, or None if it is not indexed."""
+    row = _connection().execute("SELECT digest, suffix FROM uploads WHERE name = ?", (name,)).fetchone()
+    return (row["digest"], row["suffix"]) if row else None
+
+
+def search_uploads(query: str = "", limit: int = 50, offset: int = 0):
+    """Return one page of indexed uploads whose name contains ``query``, plus the total match count.
+
+    Rows are ``sqlite3.Row`` objects with the catalog columns (``dtypes`` as
+    JSON text), ordered by name.
+    """
+    pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    conn = _connection()
+    total = conn.execute("SELECT COUNT(*) FROM uploads WHERE name LIKE ? ESCAPE '\\'", (pattern,)).fetchone()[0]
+    rows = conn.execute(
+        "SELECT * FROM uploads WHERE name LIKE ? ESCAPE '\\' ORDER BY name LIMIT ? OFFSET ?",
+        (pattern, limit, offset),
+    ).fetchall()
+    return rows, total
+
+
+def get_upload(name: str):
+    return _connection().execute("SELECT * FROM uploads WHERE name = ?", (name,)).fetchone()
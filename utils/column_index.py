@@ -0,0 +1,185 @@
+"""Per-column lookup structures stored next to a dataset, so filters need not scan columns.
+
+Numeric and datetime columns keep their non-null row positions in value
+order together with the sorted values, so a range is two binary searches.
+Low-cardinality columns keep their row positions grouped by value with an
+offset per value, so selecting values is one slice per value. The arrays are
+``.npy`` files in ``<name>.index/`` described by a ``manifest.json``, and are
+memory-mapped when loaded so every worker shares the same pages.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUCache
+from utils.columnar import read_columnar, read_columnar_schema
+from utils.file_utils import is_fresh, sidecar_path
+from utils.metrics import timed
+
+INDEX_SUFFIX = ".index"
+MANIFEST_NAME = "manifest.json"
+INDEX_MIN_ROWS = int(os.environ.get("DASH_BORED_INDEX_MIN_ROWS", "100000"))
+MAX_INDEXED_VALUES = 1000
+
+index_cache = LRUCache(max_entries=64)
+
+
+def index_dir(dataset_path: Path) -> Path:
+    return sidecar_path(dataset_path, INDEX_SUFFIX)
+
+
+def has_fresh_index(dataset_path: Path) -> bool:
+    return is_fresh(index_dir(dataset_path) / MANIFEST_NAME, dataset_path)
+
+
+def remove_column_index(dataset_path: Path) -> None:
+    shutil.rmtree(index_dir(dataset_path), ignore_errors=True)
+
+
+def _is_datetime(series: pd.Series) -> bool:
+    return pd.api.types.is_datetime64_any_dtype(series)
+
+
+def _is_range(series: pd.Series) -> bool:
+    return _is_datetime(series) or (
+        pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+    )
+
+
+def _sortable_values(series: pd.Series) -> np.ndarray:
+    if _is_datetime(series):
+        # Timezone-aware columns become UTC; bounds are converted the same way.
+        return series.to_numpy(dtype="datetime64[ns]").view("int64")
+    return series.to_numpy()
+
+
+def _index_column(directory: Path, number: int, series: pd.Series, position_type):
+    if _is_range(series):
+        valid = series.notna().to_numpy(dtype=bool)
+        positions = np.flatnonzero(valid).astype(position_type)
+        values = _sortable_values(series[valid])
+        if values.dtype == object:
+            return None
+        order = np.argsort(values, kind="stable")
+        np.save(directory / f"{number}.positions.npy", positions[order])
+        np.save(directory / f"{number}.sorted.npy", values[order])
+        tz = str(series.dt.tz) if _is_datetime(series) and series.dt.tz is not None else None
+        return {"kind": "range", "file": number, "datetime": _is_datetime(series), "tz": tz}
+
+    codes, uniques = pd.factorize(series, sort=True)
+    values = [value.item() if isinstance(value, np.generic) else value for value in uniques.tolist()]
+    if len(values) > MAX_INDEXED_VALUES or not all(isinstance(value, (str, bool)) for value in values):
+        return None
+    order = np.argsort(codes, kind="stable")
+    order = order[codes[order] >= 0]
+    offsets = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    np.save(directory / f"{number}.positions.npy", order.astype(position_type))
+    np.save(directory / f"{number}.offsets.npy", offsets.astype(np.int64))
+    return {"kind": "values", "file": number, "values": values}
+
+
+@timed("transform")
+def build_column_index(dataset_path: Path) -> None:
+    """Write the index of every column of the dataset's Arrow file, one column at a time."""
+    target = index_dir(dataset_path)
+    tmp_dir = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+    columns = {}
+    n_rows = None
+    position_type = np.int64
+    for number, column in enumerate(read_columnar_schema(dataset_path).columns):
+        series = read_columnar(dataset_path, columns=[column])[column]
+        if n_rows is None:
+            n_rows = len(series)
+            position_type = np.int32 if n_rows < 2**31 else np.int64
+        try:
+            entry = _index_column(tmp_dir, number, series, position_type)
+        except (TypeError, ValueError):
+            entry = None
+        if entry is not None:
+            columns[str(column)] = entry
+    with open(tmp_dir / MANIFEST_NAME, "w") as f:
+        json.dump({"n_rows": n_rows or 0, "columns": columns}, f)
+    # Move the old index aside first: a directory can only replace an empty one.
+    old_dir = target.with_name(f"{target.name}.{os.getpid()}.old")
+    if target.exists():
+        os.replace(target, old_dir)
+    os.replace(tmp_dir, target)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+class ColumnIndex:
+    """The loaded index of one dataset version; arrays are memory-mapped on first use."""
+
+    def __init__(self, directory: Path, manifest: dict):
+        self.directory = directory
+        self.n_rows = manifest["n_rows"]
+        self.columns = manifest["columns"]
+        self._arrays = {}
+
+    def _array(self, number, name):
+        key = (number, name)
+        if key not in self._arrays:
+            self._arrays[key] = np.load(self.directory / f"{number}.{name}.npy", mmap_mode="r")
+        return self._arrays[key]
+
+    def _range_positions(self, entry, low, high):
+        values = self._array(entry["file"], "sorted")
+        if entry["datetime"]:
+            low, high = (_utc_nanoseconds(bound, entry["tz"]) for bound in (low, high))
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        return self._array(entry["file"], "positions")[start:stop]
+
+    def _value_positions(self, entry, selected):
+        offsets = self._array(entry["file"], "offsets")
+        positions = self._array(entry["file"], "positions")
+        lookup = {json.dumps(value): number for number, value in enumerate(entry["values"])}
+        numbers = sorted({lookup[key] for key in map(json.dumps, selected) if key in lookup})
+        return [positions[offsets[number] : offsets[number + 1]] for number in numbers]
+
+    def mask(self, predicate: dict):
+        """Return the row mask for ``predicate``, or None when its column has no matching index."""
+        entry = self.columns.get(str(predicate["column"]))
+        if entry is None or (entry["kind"] == "range") != ("range" in predicate):
+            return None
+        mask = np.zeros(self.n_rows, dtype=bool)
+        try:
+            if "range" in predicate:
+                mask[self._range_positions(entry, *predicate["range"])] = True
+            else:
+                for positions in self._value_positions(entry, predicate["values"]):
+                    mask[positions] = True
+        except OSError:
+            return None
+        return mask
+
+
+def _utc_nanoseconds(bound, tz):
+    # Naive bounds are in the column's timezone, as in utils.filters.
+    if bound is None:
+        return None
+    timestamp = pd.Timestamp(bound)
+    if tz is not None and timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize(tz)
+    return timestamp.as_unit("ns").value
+
+
+def load_column_index(dataset_path: Path, version):
+    """Return the dataset's ``ColumnIndex`` for ``version``, or None when there is no current one."""
+    key = str(dataset_path)
+    index = index_cache.get(key, version)
+    if index is None and has_fresh_index(dataset_path):
+        try:
+            with open(index_dir(dataset_path) / MANIFEST_NAME) as f:
+                index = ColumnIndex(index_dir(dataset_path), json.load(f))
+        except (OSError, ValueError):
+            return None
+        index_cache.put(key, index, version)
+    return index
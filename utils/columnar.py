@@ -0,0 +1,127 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+from utils.file_utils import is_fresh, sidecar_path
+
+COLUMNAR_SUFFIX = ".arrow"
+# Streamed files up to this size are merged into one record batch (held in memory once while merging).
+MERGE_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def columnar_path(dataset_path: Path) -> Path:
+    return sidecar_path(dataset_path, COLUMNAR_SUFFIX)
+
+
+def has_fresh_columnar(dataset_path: Path) -> bool:
+    return is_fresh(columnar_path(dataset_path), dataset_path)
+
+
+def _tmp_path(target: Path) -> Path:
+    return target.with_name(f"{target.name}.{os.getpid()}.tmp")
+
+
+def write_columnar(df: pd.DataFrame, dataset_path: Path) -> bool:
+    """Persist ``df`` as an uncompressed Arrow IPC (Feather v2) file next to the source.
+
+    The frame is written as a single record batch so numeric columns can later
+    be read straight out of the memory map without a copy, letting every
+    worker process share the same pages. Object columns mixing numbers and
+    text (common in Excel) are stored as text. Returns False when the frame
+    still cannot be represented in Arrow; callers then keep using the source.
+    """
+    target = columnar_path(dataset_path)
+    tmp_path = _tmp_path(target)
+    for convert in (None, _text_mixed_columns):
+        frame = df if convert is None else convert(df)
+        try:
+            feather.write_feather(frame, tmp_path, compression="uncompressed", chunksize=max(len(frame), 1))
+        except (pa.ArrowException, ValueError, TypeError):
+            tmp_path.unlink(missing_ok=True)
+            continue
+        os.replace(tmp_path, target)
+        return True
+    return False
+
+
+def _text_mixed_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # Excel columns mixing numbers and text have no Arrow type; store them as text.
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def write_columnar_chunks(chunks, dataset_path: Path) -> bool:
+    """Stream DataFrame chunks (or Arrow record batches) into the columnar cache file.
+
+    The first chunk fixes the schema and later chunks are cast to it. Returns
+    False if a chunk cannot be cast (e.g. a column that was all integers turns
+    out to contain blanks), in which case nothing is written. Files up to
+    ``MERGE_MAX_BYTES`` are then rewritten as a single record batch so they
+    can be read without a copy; larger ones keep one batch per chunk.
+    """
+    target = columnar_path(dataset_path)
+    tmp_path = _tmp_path(target)
+    writer = None
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, pa.RecordBatch):
+                table = pa.Table.from_batches([chunk])
+            else:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_file(str(tmp_path), schema)
+            elif not table.schema.equals(schema):
+                table = table.cast(schema)
+            writer.write_table(table)
+    except (pa.ArrowException, ValueError, TypeError):
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+        return False
+    if writer is None:
+        return False
+    writer.close()
+    _merge_batches(tmp_path)
+    os.replace(tmp_path, target)
+    return True
+
+
+def _merge_batches(path: Path) -> None:
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        if reader.num_record_batches < 2 or source.size() > MERGE_MAX_BYTES:
+            return
+        table = reader.read_all().combine_chunks()
+        merged_path = path.with_name(f"{path.name}.merged")
+        with pa.ipc.new_file(str(merged_path), table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    os.replace(merged_path, path)
+
+
+def read_columnar(dataset_path: Path, columns=None) -> pd.DataFrame:
+    """Read the columnar cache through a memory map, touching only ``columns``.
+
+    Numeric columns of a single-batch file come back as zero-copy views of
+    the map, so they live in the shared OS page cache rather than in each
+    process's heap. Files with several batches are copied when read.
+    """
+    table = feather.read_table(columnar_path(dataset_path), columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def read_columnar_schema(dataset_path: Path) -> pd.DataFrame:
+    """Return a zero-row frame with the cached column names and dtypes."""
+    with pa.memory_map(str(columnar_path(dataset_path))) as source:
+        schema = pa.ipc.open_file(source).schema
+    return schema.empty_table().to_pandas()
+
+
+def columnar_nbytes(dataset_path: Path) -> int:
+    """Size of the cached columns once loaded, counting each shared dictionary once."""
+    return feather.read_table(columnar_path(dataset_path), memory_map=True).get_total_buffer_size()
@@ -0,0 +1,198 @@
+"""Type-aware CSV parsing with a schema inferred once per dataset and stored in ``<name>.schema.json``."""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.tseries.api import guess_datetime_format
+from pyarrow import csv
+
+from utils.file_utils import is_fresh, sidecar_path
+
+SCHEMA_SUFFIX = ".schema.json"
+BLOCK_BYTES = 16 * 1024 * 1024
+CATEGORY_MAX_DISTINCT = 1000
+CATEGORY_MAX_RATIO = 0.5
+INT_TYPES = (pa.int8(), pa.int16(), pa.int32(), pa.int64())
+# pandas' default na_values, so pyarrow and read_csv agree on what is missing
+NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def schema_path(dataset_path: Path) -> Path:
+    return sidecar_path(dataset_path, SCHEMA_SUFFIX)
+
+
+class _ColumnStats:
+    """What one pass over a column has seen so far."""
+
+    def __init__(self, arrow_type):
+        self.type = arrow_type
+        self.min = self.max = None
+        self.distinct = set()
+        self.count = 0
+        self.date_format = None
+        self.maybe_date = pa.types.is_string(arrow_type)
+
+    def add(self, array: pa.Array) -> None:
+        if pa.types.is_integer(self.type):
+            bounds = pc.min_max(array).as_py()
+            if bounds["min"] is not None:
+                self.min = bounds["min"] if self.min is None else min(self.min, bounds["min"])
+                self.max = bounds["max"] if self.max is None else max(self.max, bounds["max"])
+        if not pa.types.is_string(self.type):
+            return
+        self.count += len(array) - array.null_count
+        if self.distinct is not None:
+            self.distinct.update(pc.unique(array.drop_null()).to_pylist())
+            if len(self.distinct) > CATEGORY_MAX_DISTINCT:
+                self.distinct = None
+        if self.maybe_date:
+            self.maybe_date = self._all_dates(array)
+
+    def _all_dates(self, array: pa.Array) -> bool:
+        values = array.drop_null()
+        if not len(values):
+            return True
+        if self.date_format is None:
+            self.date_format = guess_datetime_format(values[0].as_py())
+            if self.date_format is None:
+                return False
+        try:
+            if self.date_format.startswith("%Y-%m-%d"):
+                values.cast(pa.timestamp("ns"))
+                return True
+            parsed = pc.strptime(values, format=self.date_format, unit="ns", error_is_null=True)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return False
+        return parsed.null_count == 0
+
+    def column_schema(self) -> dict:
+        if pa.types.is_integer(self.type):
+            for int_type in INT_TYPES:
+                limits = np.iinfo(int_type.to_pandas_dtype())
+                if self.min is None or (limits.min <= self.min and self.max <= limits.max):
+                    return {"type": str(int_type)}
+        if pa.types.is_floating(self.type):
+            return {"type": "double"}
+        if pa.types.is_boolean(self.type):
+            return {"type": "bool"}
+        if pa.types.is_timestamp(self.type):
+            return {"type": "timestamp", "tz": self.type.tz}
+        if pa.types.is_date(self.type):
+            return {"type": "timestamp", "tz": None}
+        if self.maybe_date and self.date_format and self.count:
+            iso = self.date_format.startswith("%Y-%m-%d")
+            return {"type": "timestamp", "tz": None, "format": None if iso else self.date_format}
+        if self.distinct is not None and self.count and len(self.distinct) <= self.count * CATEGORY_MAX_RATIO:
+            return {"type": "category", "values": sorted(self.distinct)}
+        return {"type": "string"}
+
+
+def _arrow_type(column: dict) -> pa.DataType:
+    if column["type"] == "timestamp":
+        return pa.timestamp("ns", tz=column["tz"])
+    if column["type"] == "category":
+        return pa.string()
+    return pa.type_for_alias(column["type"])
+
+
+def _open(dataset_path: Path, schema=None):
+    column_types, formats = {}, set()
+    if schema is not None:
+        column_types = {name: _arrow_type(column) for name, column in schema["columns"].items()}
+        formats = {column["format"] for column in schema["columns"].values() if column.get("format")}
+    convert_options = csv.ConvertOptions(
+        column_types=column_types,
+        null_values=NULL_VALUES,
+        strings_can_be_null=True,
+        timestamp_parsers=[csv.ISO8601, *sorted(formats)],
+    )
+    return csv.open_csv(
+        str(dataset_path),
+        read_options=csv.ReadOptions(block_size=BLOCK_BYTES),
+        convert_options=convert_options,
+    )
+
+
+def infer_csv_schema(dataset_path: Path):
+    """Pick compact types from one pass over the whole file, or None if pyarrow cannot parse it.
+
+    Integers get the narrowest width that holds their range, text columns
+    that are all dates become timestamps and text columns with few distinct
+    values become categoricals with a sorted dictionary.
+    """
+    try:
+        reader = _open(dataset_path)
+        names = reader.schema.names
+        if "" in names or len(set(names)) != len(names):
+            return None
+        stats = [_ColumnStats(field.type) for field in reader.schema]
+        default_bytes = 0
+        for batch in reader:
+            default_bytes += batch.get_total_buffer_size()
+            for column, array in zip(stats, batch.columns):
+                column.add(array)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, OSError):
+        return None
+    return {
+        "columns": {name: column.column_schema() for name, column in zip(names, stats)},
+        "default_bytes": default_bytes,
+    }
+
+
+def csv_schema(dataset_path: Path):
+    """Return the stored schema for a CSV file, inferring and storing it on first use."""
+    target = schema_path(dataset_path)
+    if is_fresh(target, dataset_path):
+        with open(target) as f:
+            return json.load(f).get("schema")
+    schema = infer_csv_schema(dataset_path)
+    # Stored even when None, so a file pyarrow cannot parse is not re-scanned.
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"schema": schema}, f)
+    os.replace(tmp_path, target)
+    return schema
+
+
+def read_csv_batches(dataset_path: Path, schema: dict):
+    """Stream the file as record batches with the schema's types, categoricals dictionary-encoded.
+
+    Every batch shares one dictionary per categorical column, so the batches
+    can go into a single Arrow IPC file.
+    """
+    dictionaries = {
+        name: pa.array(column["values"], pa.string())
+        for name, column in schema["columns"].items()
+        if column["type"] == "category"
+    }
+    index_type = pa.int8() if max(map(len, dictionaries.values()), default=0) < 128 else pa.int16()
+    for batch in _open(dataset_path, schema):
+        if not dictionaries:
+            yield batch
+            continue
+        arrays = []
+        for name, array in zip(batch.schema.names, batch.columns):
+            if name in dictionaries:
+                indices = pc.index_in(array, value_set=dictionaries[name]).cast(index_type)
+                array = pa.DictionaryArray.from_arrays(indices, dictionaries[name])
+            arrays.append(array)
+        yield pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+def read_csv_typed(dataset_path: Path):
+    """Parse a whole CSV file with its stored schema, or return None when it has none."""
+    schema = csv_schema(dataset_path)
+    if schema is None:
+        return None
+    batches = list(read_csv_batches(dataset_path, schema))
+    if not batches:
+        return None
+    return pa.Table.from_batches(batches).to_pandas(split_blocks=True)
+
@@ -1,27 +1,214 @@
+import json
+import os
 from pathlib import Path
 import pandas as pd
 
+from utils.cache import LRUCache
+from utils.catalog import record_dataset_stats
+from utils.column_index import INDEX_MIN_ROWS, build_column_index, has_fresh_index, load_column_index
+from utils.columnar import (
+    columnar_nbytes,
+    has_fresh_columnar,
+    read_columnar,
+    read_columnar_schema,
+    write_columnar,
+    write_columnar_chunks,
+)
+from utils.csv_schema import csv_schema, read_csv_batches, read_csv_typed
+from utils.file_utils import is_fresh, sidecar_path, upload_path
+from utils.filters import filter_key, filter_rows
+from utils.metrics import timed
+
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CACHE_MAX_BYTES = int(os.environ.get("DASH_BORED_CACHE_MB", "512")) * 1024 * 1024
+CSV_CHUNK_ROWS = 200_000
+SUMMARY_SUFFIX = ".summary.json"
+NUMERIC_METRICS = ["mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
 
+dataset_cache = LRUCache(max_bytes=CACHE_MAX_BYTES, sizeof=_frame_nbytes)
+summary_cache = LRUCache(max_entries=256)
+schema_cache = LRUCache(max_entries=256)
 
-def load_dataset(dataset_value: str) -> pd.DataFrame:
+
+def resolve_dataset_path(dataset_value: str):
     if not dataset_value:
-        return pd.DataFrame()
+        return None
     if dataset_value.startswith("uploads/"):
-        dataset_path = DATA_DIR / dataset_value
-    else:
-        dataset_path = DATA_DIR / "example" / dataset_value
+        return upload_path(dataset_value[len("uploads/") :])
+    return DATA_DIR / "example" / dataset_value
+
+
+def dataset_version(dataset_path: Path):
+    stat = dataset_path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
 
-    if not dataset_path.exists():
-        return pd.DataFrame()
 
+def dataset_fingerprint(dataset_value: str, filters=None):
+    """Identify the current contents of a dataset, or of its rows matching ``filters``; None when it is missing."""
+    dataset_path = resolve_dataset_path(dataset_value)
+    if dataset_path is None or not dataset_path.exists():
+        return None
+    name = (str(dataset_path), filter_key(filters)) if filters else str(dataset_path)
+    return (name, *dataset_version(dataset_path))
+
+
+def _parse_source(dataset_path: Path) -> pd.DataFrame:
     if dataset_path.suffix.lower() == ".csv":
-        return pd.read_csv(dataset_path)
+        df = read_csv_typed(dataset_path)
+        return df if df is not None else pd.read_csv(dataset_path)
     if dataset_path.suffix.lower() in {".xlsx", ".xls"}:
         return pd.read_excel(dataset_path)
     return pd.DataFrame()
 
 
+def _read_dataset(dataset_path: Path) -> pd.DataFrame:
+    if has_fresh_columnar(dataset_path):
+        return read_columnar(dataset_path)
+    df = _parse_source(dataset_path)
+    if not df.empty:
+        write_columnar(df, dataset_path)
+    return df
+
+
+@timed("load")
+def prepare_dataset(dataset_value: str) -> None:
+    """Parse a freshly saved dataset once and write its columnar cache and summary files.
+
+    CSV files are streamed with their inferred schema (or in pandas chunks if
+    pyarrow cannot parse them) and summarized one column at a time, so peak
+    memory stays bounded. Datasets of at least ``INDEX_MIN_ROWS`` rows also
+    get per-column indexes for filtering. Uploads also get their row/column
+    counts recorded in the catalog.
+    """
+    dataset_path = resolve_dataset_path(dataset_value)
+    if dataset_path is None or not dataset_path.exists():
+        return
+    if not (has_fresh_columnar(dataset_path) and is_fresh(sidecar_path(dataset_path, SUMMARY_SUFFIX), dataset_path)):
+        _write_sidecars(dataset_path)
+    summary = load_summary(dataset_value)
+    if summary["n_rows"] >= INDEX_MIN_ROWS and has_fresh_columnar(dataset_path) and not has_fresh_index(dataset_path):
+        build_column_index(dataset_path)
+    if dataset_value.startswith("uploads/"):
+        dtypes = {col: info["dtype"] for col, info in summary["column_summary"].items()}
+        record_dataset_stats(dataset_value[len("uploads/") :], summary["n_rows"], summary["n_columns"], dtypes)
+
+
+def _write_sidecars(dataset_path: Path) -> None:
+    version = dataset_version(dataset_path)
+    is_csv = dataset_path.suffix.lower() == ".csv"
+    schema = csv_schema(dataset_path) if is_csv else None
+    if schema is not None and write_columnar_chunks(read_csv_batches(dataset_path, schema), dataset_path):
+        summary = _summarize_columnar(dataset_path)
+        summary["memory"] = {"default_bytes": schema["default_bytes"], "typed_bytes": columnar_nbytes(dataset_path)}
+    elif is_csv and write_columnar_chunks(pd.read_csv(dataset_path, chunksize=CSV_CHUNK_ROWS), dataset_path):
+        summary = _summarize_columnar(dataset_path)
+    else:
+        df = _parse_source(dataset_path)
+        if not df.empty:
+            write_columnar(df, dataset_path)
+        dataset_cache.put(str(dataset_path), df, version)
+        summary = build_summary(df)
+    _write_summary(dataset_path, summary)
+    summary_cache.put(str(dataset_path), summary, version)
+
+
+def _summarize_columnar(dataset_path: Path) -> dict:
+    columns = list(read_columnar_schema(dataset_path).columns)
+    summary = build_summary(pd.DataFrame())
+    summary.update({"n_columns": len(columns), "columns": columns})
+    for col in columns:
+        column_summary = build_summary(read_columnar(dataset_path, columns=[col]))
+        summary["n_rows"] = column_summary["n_rows"]
+        summary["column_summary"].update(column_summary["column_summary"])
+        summary["numeric_summary"].update(column_summary["numeric_summary"])
+    return summary
+
+
+@timed("load")
+def load_dataset(dataset_value: str, columns=None, filters=None) -> pd.DataFrame:
+    """Return the dataset (or just ``columns`` of it), restricted to the rows matching ``filters``."""
+    dataset_path = resolve_dataset_path(dataset_value)
+    if dataset_path is None or not dataset_path.exists():
+        return pd.DataFrame()
+
+    key = str(dataset_path)
+    version = dataset_version(dataset_path)
+    if filters:
+        df = _load_filtered(dataset_value, key, version, filters)
+        return df if columns is None else df[[col for col in dict.fromkeys(columns) if col in df.columns]]
+    df = dataset_cache.get(key, version)
+    if df is None and columns is not None and has_fresh_columnar(dataset_path):
+        return _load_projection(dataset_path, columns, version)
+    if df is None:
+        df = _read_dataset(dataset_path)
+        dataset_cache.put(key, df, version)
+    if columns is not None:
+        return df[[col for col in dict.fromkeys(columns) if col in df.columns]]
+    return df
+
+
+def _load_filtered(dataset_value: str, key: str, version, filters) -> pd.DataFrame:
+    # One filtered copy per (dataset version, filter spec), shared by every pane that uses it.
+    filtered_key = (key, filter_key(filters))
+    df = dataset_cache.get(filtered_key, version)
+    if df is None:
+        full = load_dataset(dataset_value)
+        index = load_column_index(Path(key), version)
+        df = full[filter_rows(full, key, version, filters, index)].reset_index(drop=True)
+        dataset_cache.put(filtered_key, df, version)
+    return df
+
+
+def _load_projection(dataset_path: Path, columns, version) -> pd.DataFrame:
+    available = set(read_columnar_schema(dataset_path).columns)
+    selected = tuple(col for col in dict.fromkeys(columns) if col in available)
+    key = (str(dataset_path), selected)
+    df = dataset_cache.get(key, version)
+    if df is None:
+        df = read_columnar(dataset_path, columns=list(selected))
+        dataset_cache.put(key, df, version)
+    return df
+
+
+@timed("load")
+def load_schema(dataset_value: str) -> pd.DataFrame:
+    """Return a zero-row frame carrying the dataset's column names and dtypes."""
+    dataset_path = resolve_dataset_path(dataset_value)
+    if dataset_path is None or not dataset_path.exists():
+        return pd.DataFrame()
+    df = dataset_cache.get(str(dataset_path), dataset_version(dataset_path))
+    if df is None and has_fresh_columnar(dataset_path):
+        return read_columnar_schema(dataset_path)
+    if df is None:
+        df = load_dataset(dataset_value)
+    return df.iloc[:0]
+
+
+@timed("load")
+def dataset_schema(dataset_value: str) -> dict:
+    """Column names, dtype names and numeric columns for a dataset, memoized per version."""
+    dataset_path = resolve_dataset_path(dataset_value)
+    if dataset_path is None or not dataset_path.exists():
+        return {"columns": [], "dtypes": {}, "numeric": []}
+    key = str(dataset_path)
+    version = dataset_version(dataset_path)
+    schema = schema_cache.get(key, version)
+    if schema is None:
+        df = load_schema(dataset_value)
+        schema = {
+            "columns": list(df.columns),
+            "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+            "numeric": detect_numeric_columns(df),
+        }
+        schema_cache.put(key, schema, version)
+    return schema
+
+
 def detect_numeric_columns(df: pd.DataFrame) -> list:
     numeric_df = df.select_dtypes(include="number")
     return list(numeric_df.columns)
@@ -33,10 +220,72 @@ def build_summary(df: pd.DataFrame) -> dict:
         "n_columns": len(df.columns),
         "columns": list(df.columns),
         "numeric_summary": {},
+        "column_summary": {},
     }
-    if not df.empty:
-        numeric_cols = detect_numeric_columns(df)
-        if numeric_cols:
-            numeric_stats = df[numeric_cols].agg(["mean", "min", "max"]).round(2)
-            summary["numeric_summary"] = numeric_stats.to_dict()
+    if df.empty:
+        return summary
+
+    counts = df.count()
+    distinct = df.nunique()
+    for col in df.columns:
+        summary["column_summary"][col] = {
+            "dtype": str(df[col].dtype),
+            "count": int(counts[col]),
+            "nulls": int(len(df) - counts[col]),
+            "distinct": int(distinct[col]),
+        }
+
+    numeric_cols = detect_numeric_columns(df)
+    if numeric_cols:
+        numeric = df[numeric_cols]
+        stats = pd.concat(
+            [
+                numeric.agg(["mean", "std", "min", "max"]),
+                numeric.quantile([0.25, 0.5, 0.75]).rename(index={0.25: "25%", 0.5: "50%", 0.75: "75%"}),
+            ]
+        )
+        summary["numeric_summary"] = stats.loc[NUMERIC_METRICS].astype(float).round(2).to_dict()
+    return summary
+
+
+def _write_summary(dataset_path: Path, summary: dict) -> None:
+    target = sidecar_path(dataset_path, SUMMARY_SUFFIX)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(summary, f)
+    os.replace(tmp_path, target)
+
+
+@timed("load")
+def load_summary(dataset_value: str, filters=None):
+    """Return summary statistics for a dataset, computing them at most once per version.
+
+    Results are kept in memory and in a ``.summary.json`` file next to the
+    dataset, so a restart or another worker can reuse them without reading rows.
+    Summaries of filtered rows are only kept in memory.
+    """
+    dataset_path = resolve_dataset_path(dataset_value)
+    if dataset_path is None or not dataset_path.exists():
+        return None
+    key = str(dataset_path)
+    version = dataset_version(dataset_path)
+    if filters:
+        filtered_key = (key, filter_key(filters))
+        summary = summary_cache.get(filtered_key, version)
+        if summary is None:
+            summary = build_summary(load_dataset(dataset_value, filters=filters))
+            summary_cache.put(filtered_key, summary, version)
+        return summary
+    summary = summary_cache.get(key, version)
+    if summary is not None:
+        return summary
+
+    summary_file = sidecar_path(dataset_path, SUMMARY_SUFFIX)
+    if is_fresh(summary_file, dataset_path):
+        with open(summary_file) as f:
+            summary = json.load(f)
+    else:
+        summary = build_summary(load_dataset(dataset_value))
+        _write_summary(dataset_path, summary)
+    summary_cache.put(key, summary, version)
     return summary
@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import timed
+
+MAX_POINTS = int(os.environ.get("DASH_BORED_MAX_POINTS", "5000"))
+
+
+def _axis_values(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype="float64")
+    codes, _ = pd.factorize(series)
+    return codes.astype("float64")
+
+
+def is_range_axis(series: pd.Series) -> bool:
+    if pd.api.types.is_bool_dtype(series):
+        return False
+    return pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
+
+
+@timed("transform")
+def clip_to_range(df: pd.DataFrame, x_column, x_range) -> pd.DataFrame:
+    """Keep the rows whose x value falls inside a zoomed ``[start, end]`` window."""
+    if not x_range or not is_range_axis(df[x_column]):
+        return df
+    start, end = x_range
+    if pd.api.types.is_datetime64_any_dtype(df[x_column]):
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+    return df[df[x_column].between(start, end)]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets selection of ``n_out`` points from x-sorted data."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_start = min(end, next_end - 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[anchor] - avg_x) * (y[start:end] - y[anchor]) - (x[anchor] - x[start:end]) * (avg_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(area))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def grid_thin_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Keep one point per occupied cell of a 2-D grid, then thin evenly down to ``n_out``."""
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+
+    cells = max(int(np.sqrt(n_out)) * 2, 1)
+
+    def _cell(values):
+        low, high = values.min(), values.max()
+        span = high - low or 1.0
+        return np.minimum(((values - low) / span * cells).astype(np.int64), cells - 1)
+
+    cell_id = _cell(x) * cells + _cell(y)
+    _, first = np.unique(cell_id, return_index=True)
+    if len(first) > n_out:
+        first = np.sort(first)[np.linspace(0, len(first) - 1, n_out).astype(np.int64)]
+    return np.sort(first)
+
+
+@timed("transform")
+def downsample_frame(df: pd.DataFrame, x_column, y_column, color_column=None, max_points=MAX_POINTS, method="lttb"):
+    """Reduce ``df`` to roughly ``max_points`` rows before plotting.
+
+    Each color group receives a share of the budget proportional to its size.
+    ``method`` is ``"lttb"`` for x-sorted line/area data or ``"grid"`` for
+    scatter data. Returns the reduced frame and the original row count.
+    """
+    total = len(df)
+    if max_points <= 0 or total <= max_points:
+        return df, total
+
+    data = df.dropna(subset=[x_column, y_column])
+    if data.empty:
+        return data, total
+    select = lttb_indices if method == "lttb" else grid_thin_indices
+    if color_column:
+        groups = data.groupby(color_column, observed=True, sort=False).indices.values()
+    else:
+        groups = [np.arange(len(data))]
+
+    x_values = _axis_values(data[x_column])
+    y_values = _axis_values(data[y_column])
+    keep = []
+    for positions in groups:
+        quota = max(3, int(max_points * len(positions) / len(data)))
+        keep.append(positions[select(x_values[positions], y_values[positions], quota)])
+    positions = np.sort(np.concatenate(keep)) if keep else np.array([], dtype=np.int64)
+    return data.iloc[positions], total
@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from utils.cache import LRUCache
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+FIGURE_CACHE_DIR = DATA_DIR / "cache" / "figures"
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get("DASH_BORED_FIGURE_CACHE_MB", "64")) * 1024 * 1024
+FIGURE_CACHE_ON_DISK = os.environ.get("DASH_BORED_FIGURE_CACHE_DISK", "0") == "1"
+
+figure_cache = LRUCache(max_bytes=FIGURE_CACHE_MAX_BYTES, sizeof=lambda entry: len(entry["figure"]))
+_disk_stats = {"disk_hits": 0, "disk_misses": 0, "disk_writes": 0}
+_disk_lock = threading.Lock()
+
+
+def figure_key(fingerprint, spec: dict) -> str:
+    """Hash a dataset fingerprint and chart spec into a stable cache key."""
+    payload = json.dumps([fingerprint, spec], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _disk_path(key: str) -> Path:
+    return FIGURE_CACHE_DIR / f"{key}.json"
+
+
+def get_figure(key: str):
+    """Return a cached ``{"figure": <json text>, "rows": int}`` entry, or None."""
+    entry = figure_cache.get(key)
+    if entry is not None or not FIGURE_CACHE_ON_DISK:
+        return entry
+    path = _disk_path(key)
+    if not path.exists():
+        with _disk_lock:
+            _disk_stats["disk_misses"] += 1
+        return None
+    with open(path) as f:
+        entry = json.load(f)
+    with _disk_lock:
+        _disk_stats["disk_hits"] += 1
+    figure_cache.put(key, entry)
+    return entry
+
+
+def has_figure(key: str) -> bool:
+    return key in figure_cache or (FIGURE_CACHE_ON_DISK and _disk_path(key).exists())
+
+
+def put_figure(key: str, figure_json: str, rows: int) -> None:
+    entry = {"figure": figure_json, "rows": rows}
+    figure_cache.put(key, entry)
+    if not FIGURE_CACHE_ON_DISK:
+        return
+    FIGURE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _disk_path(key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+    with _disk_lock:
+        _disk_stats["disk_writes"] += 1
+
+
+def figure_cache_stats() -> dict:
+    with _disk_lock:
+        return {**figure_cache.stats(), **_disk_stats, "on_disk": FIGURE_CACHE_ON_DISK}
@@ -1,9 +1,23 @@
 import base64
+import hashlib
+import os
+import shutil
+import uuid
 from pathlib import Path
 
+from utils.catalog import get_upload, lookup_upload, register_upload, search_uploads
+
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 UPLOADS_DIR = DATA_DIR / "uploads"
 EXAMPLE_DIR = DATA_DIR / "example"
+PARTIAL_DIR = UPLOADS_DIR / ".partial"
+OBJECTS_DIR = UPLOADS_DIR / "objects"
+SUPPORTED_SUFFIXES = {".csv", ".xlsx"}
+DECODE_BLOCK_CHARS = 4 * 1024 * 1024
+COPY_BLOCK_BYTES = 1024 * 1024
+DATASET_PAGE_SIZE = 50
+
+_loose_uploads_migrated = False
 
 
 def ensure_data_dirs_exist():
@@ -11,27 +25,159 @@ def ensure_data_dirs_exist():
     EXAMPLE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def sidecar_path(dataset_path: Path, suffix: str) -> Path:
+    return dataset_path.with_name(dataset_path.name + suffix)
+
+
+def is_fresh(sidecar: Path, source: Path) -> bool:
+    if not sidecar.exists():
+        return False
+    return sidecar.stat().st_mtime_ns >= source.stat().st_mtime_ns
+
+
 def _sanitize_filename(filename: str) -> str:
     cleaned = filename.replace(" ", "_")
     return "".join(char for char in cleaned if char.isalnum() or char in {"_", "."})
 
 
+def object_path(digest: str, suffix: str) -> Path:
+    return OBJECTS_DIR / f"{digest}{suffix}"
+
+
+def upload_path(name: str) -> Path:
+    """Resolve an uploaded dataset name to its content-addressed object.
+
+    Names that are not in the upload index fall back to a plain file under
+    ``data/uploads`` (files placed there by hand or by older versions).
+    """
+    entry = lookup_upload(name)
+    if entry is None:
+        return UPLOADS_DIR / name
+    return object_path(*entry)
+
+
+def _commit_upload(tmp_path: Path, name: str, digest: str) -> str:
+    """Move a fully written upload into the object store and index it under ``name``.
+
+    Identical content is stored once: if an object with the same hash already
+    exists the new copy is discarded, and its columnar/summary sidecars stay
+    valid for the new name.
+    """
+    suffix = Path(name).suffix.lower()
+    target = object_path(digest, suffix)
+    if target.exists():
+        tmp_path.unlink()
+    else:
+        OBJECTS_DIR.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, target)
+    register_upload(name, digest, suffix, target.stat().st_size)
+    return f"uploads/{name}"
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(COPY_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def save_uploaded_file(contents: str, filename: str) -> str:
-    ensure_data_dirs_exist()
     if "," not in contents:
         raise ValueError("Invalid upload contents")
     header, encoded = contents.split(",", 1)
-    data = base64.b64decode(encoded)
     sanitized = _sanitize_filename(filename)
-    save_path = UPLOADS_DIR / sanitized
-    with open(save_path, "wb") as f:
-        f.write(data)
-    relative_value = f"uploads/{sanitized}"
-    return relative_value
+    PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = PARTIAL_DIR / f"{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    with open(tmp_path, "wb") as f:
+        for start in range(0, len(encoded), DECODE_BLOCK_CHARS):
+            block = base64.b64decode(encoded[start : start + DECODE_BLOCK_CHARS])
+            digest.update(block)
+            f.write(block)
+    return _commit_upload(tmp_path, sanitized, digest.hexdigest())
+
 
+def _partial_path(upload_id: str) -> Path:
+    if not upload_id or not all(char.isalnum() or char == "-" for char in upload_id):
+        raise ValueError("Invalid upload id")
+    return PARTIAL_DIR / f"{upload_id}.part"
 
-def list_available_datasets():
+
+def append_upload_chunk(upload_id: str, offset: int, stream) -> int:
+    """Stream one chunk of a multi-request upload to disk and return the bytes received so far.
+
+    A chunk at offset 0 restarts the upload; any other offset must match the
+    bytes already received, so a client can safely retry a failed chunk.
+    """
+    PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+    part_path = _partial_path(upload_id)
+    received = part_path.stat().st_size if part_path.exists() else 0
+    if offset not in (0, received):
+        raise ValueError(f"Expected chunk at offset {received}, got {offset}")
+    with open(part_path, "wb" if offset == 0 else "ab") as f:
+        while True:
+            block = stream.read(COPY_BLOCK_BYTES)
+            if not block:
+                break
+            f.write(block)
+    return part_path.stat().st_size
+
+
+def finalize_chunked_upload(upload_id: str, filename: str) -> str:
+    part_path = _partial_path(upload_id)
+    sanitized = _sanitize_filename(filename)
+    if Path(sanitized).suffix.lower() not in SUPPORTED_SUFFIXES:
+        part_path.unlink(missing_ok=True)
+        raise ValueError("Only .csv and .xlsx files are supported")
+    if not part_path.exists():
+        raise ValueError("Unknown upload id")
+    return _commit_upload(part_path, sanitized, _file_digest(part_path))
+
+
+def _migrate_loose_uploads():
+    """Move files saved directly under ``data/uploads`` into the object store and index.
+
+    Runs once per process: after that every upload goes through the catalog,
+    so listings never have to scan the uploads directory. Workers may run it
+    at the same time; a file another worker moved first is skipped.
+    """
+    global _loose_uploads_migrated
+    if _loose_uploads_migrated:
+        return
+    for file in sorted(UPLOADS_DIR.iterdir()):
+        if not file.is_file() or file.suffix.lower() not in SUPPORTED_SUFFIXES:
+            continue
+        for sidecar in UPLOADS_DIR.glob(f"{file.name}.*"):
+            if sidecar.is_dir():
+                shutil.rmtree(sidecar, ignore_errors=True)
+            else:
+                sidecar.unlink(missing_ok=True)
+        try:
+            _commit_upload(file, file.name, _file_digest(file))
+        except FileNotFoundError:
+            # Moved into the object store (and indexed) by another worker.
+            continue
+    _loose_uploads_migrated = True
+
+
+def _upload_option(entry) -> dict:
+    label = f"Uploaded: {entry['name']}"
+    if entry["n_rows"] is not None:
+        label += f" ({entry['n_rows']:,} rows x {entry['n_columns']} cols)"
+    return {"label": label, "value": f"uploads/{entry['name']}"}
+
+
+def list_available_datasets(search: str = "", selected: str = None, limit: int = DATASET_PAGE_SIZE):
+    """Return dropdown options for the example and the first ``limit`` uploads matching ``search``.
+
+    Labels come from the upload catalog, so no dataset file is opened. The
+    ``selected`` dataset is always included so the dropdown can still show
+    it, and a disabled hint notes how many further matches a search would
+    narrow down.
+    """
     ensure_data_dirs_exist()
+    _migrate_loose_uploads()
     options = []
     example_file = EXAMPLE_DIR / "example_sales.csv"
     if example_file.exists():
@@ -40,10 +186,16 @@ def list_available_datasets():
             "value": "example_sales.csv",
         })
 
-    for file in sorted(UPLOADS_DIR.iterdir()):
-        if file.is_file() and file.suffix.lower() in {".csv", ".xlsx"}:
-            options.append({
-                "label": f"Uploaded: {file.name}",
-                "value": f"uploads/{file.name}",
-            })
+    entries, total = search_uploads(search, limit)
+    options.extend(_upload_option(entry) for entry in entries)
+    if selected and selected.startswith("uploads/") and all(option["value"] != selected for option in options):
+        entry = get_upload(selected[len("uploads/") :])
+        if entry is not None:
+            options.append(_upload_option(entry))
+    if total > len(entries):
+        options.append({
+            "label": f"... {total - len(entries):,} more, type to search",
+            "value": "",
+            "disabled": True,
+        })
     return options
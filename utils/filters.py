@@ -0,0 +1,108 @@
+"""Row filters shared by every pane: numeric/date ranges and category selections.
+
+A filter spec is a list of ``{"column", "range": [low, high]}`` or
+``{"column", "values": [...]}`` predicates that all have to hold. Each
+predicate is evaluated once per dataset version as a boolean mask over the
+whole dataset and cached, so changing one filter reuses the other columns'
+masks.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUCache
+from utils.metrics import timed
+
+FILTER_ROWS = 3
+MAX_FILTER_OPTIONS = 500
+
+mask_cache = LRUCache(max_bytes=64 * 1024 * 1024, sizeof=lambda mask: mask.nbytes)
+
+
+def is_range_column(dtype_name: str, numeric: bool) -> bool:
+    """Numeric (non-boolean) and datetime columns are filtered by range, everything else by value."""
+    return (numeric and dtype_name != "bool") or dtype_name.startswith("datetime64")
+
+
+def _bound(value, is_datetime):
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        return pd.Timestamp(str(value).strip()).isoformat() if is_datetime else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_filter(schema: dict, column, low=None, high=None, values=None):
+    """Turn one row of filter controls into a predicate, or None when it does not filter anything."""
+    if column not in schema["dtypes"]:
+        return None
+    dtype_name = schema["dtypes"][column]
+    if is_range_column(dtype_name, column in schema["numeric"]):
+        is_datetime = dtype_name.startswith("datetime64")
+        bounds = [_bound(low, is_datetime), _bound(high, is_datetime)]
+        if bounds == [None, None]:
+            return None
+        return {"column": column, "range": bounds}
+    if not values:
+        return None
+    return {"column": column, "values": sorted(values, key=lambda value: (str(type(value)), value))}
+
+
+def filter_key(filters) -> str:
+    """A canonical string for a filter spec, used in cache keys ("" when unfiltered)."""
+    if not filters:
+        return ""
+    return json.dumps(sorted(filters, key=lambda item: json.dumps(item, sort_keys=True)), sort_keys=True)
+
+
+def filter_options(series: pd.Series) -> list:
+    """The most frequent values of a column (at most ``MAX_FILTER_OPTIONS``) as dropdown options."""
+    values = series.value_counts().index[:MAX_FILTER_OPTIONS]
+    return [{"label": str(value), "value": value} for value in sorted(values.tolist(), key=str)]
+
+
+def _timestamp(bound, tz):
+    if bound is None:
+        return None
+    timestamp = pd.Timestamp(bound)
+    return timestamp.tz_localize(tz) if tz is not None and timestamp.tzinfo is None else timestamp
+
+
+def _predicate_mask(series: pd.Series, predicate: dict) -> np.ndarray:
+    if "values" in predicate:
+        return series.isin(predicate["values"]).to_numpy(dtype=bool)
+    low, high = predicate["range"]
+    if pd.api.types.is_datetime64_any_dtype(series):
+        low, high = (_timestamp(bound, series.dt.tz) for bound in (low, high))
+    mask = series.notna().to_numpy(dtype=bool, copy=True)
+    if low is not None:
+        mask &= (series >= low).to_numpy(dtype=bool, na_value=False)
+    if high is not None:
+        mask &= (series <= high).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+@timed("transform")
+def filter_rows(df: pd.DataFrame, cache_key, version, filters, index=None) -> np.ndarray:
+    """Return the combined boolean row mask of ``filters`` over ``df``.
+
+    Per-predicate masks are cached under ``cache_key`` (the dataset path)
+    and ``version``. A ``ColumnIndex`` of the same version turns range and
+    value predicates on indexed columns into lookups instead of scans.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for predicate in filters:
+        if predicate["column"] not in df.columns:
+            continue
+        key = (cache_key, json.dumps(predicate, sort_keys=True))
+        column_mask = mask_cache.get(key, version)
+        if column_mask is None and index is not None and index.n_rows == len(df):
+            column_mask = index.mask(predicate)
+        if column_mask is None:
+            column_mask = _predicate_mask(df[predicate["column"]], predicate)
+        mask_cache.put(key, column_mask, version)
+        mask &= column_mask
+    return mask
@@ -0,0 +1,328 @@
+"""Callback timing spans, payload sizes and cache counters, exported for Prometheus.
+
+Observations are accumulated in a small diskcache store under
+``data/cache/metrics`` rather than in process memory, so every gunicorn
+worker and every background-job process adds to the same counters and any
+worker can answer a ``/metrics`` scrape.
+
+Each callback decorated with ``timed_callback`` opens a trace. Functions
+decorated with ``timed(stage)`` record their *exclusive* time into that
+trace under ``load``, ``transform`` or ``render`` (time spent in a nested
+timed function counts towards the nested stage only). ``serialize`` is the
+rest of the HTTP request after the callback returned, i.e. Dash encoding the
+response, and is measured by request hooks together with the response size.
+
+Callbacks that render several panes wrap each one with ``pane_task``. A pane
+keeps its own trace (so it can run on a worker thread), its wall time is
+recorded per view type, and its stage spans are added to the callback's; for
+panes rendered concurrently the stages can add up to more than the wall time.
+"""
+
+import contextvars
+import functools
+import logging
+import os
+import reprlib
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+import dash
+import diskcache
+import flask
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+METRICS_DIR = DATA_DIR / "cache" / "metrics"
+SLOW_CALLBACK_SECONDS = float(os.environ.get("DASH_BORED_SLOW_CALLBACK_MS", "1000")) / 1000
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# name -> (help, buckets, scale used to store the float sum as an integer)
+HISTOGRAMS = {
+    "dash_bored_callback_seconds": ("Wall time of Dash callback functions.", LATENCY_BUCKETS, 1e6),
+    "dash_bored_callback_stage_seconds": (
+        "Time per stage (load, transform, render, serialize) of Dash callbacks.",
+        LATENCY_BUCKETS,
+        1e6,
+    ),
+    "dash_bored_callback_response_bytes": ("Size of Dash callback responses.", BYTES_BUCKETS, 1),
+    "dash_bored_pane_seconds": ("Wall time of rendering one dashboard pane, by view type.", LATENCY_BUCKETS, 1e6),
+}
+COUNTERS = {
+    "dash_bored_callback_errors_total": "Dash callbacks that raised an exception.",
+    "dash_bored_slow_callbacks_total": "Dash callbacks slower than DASH_BORED_SLOW_CALLBACK_MS.",
+    "dash_bored_cache_hits_total": "In-memory cache lookups that found a current entry.",
+    "dash_bored_cache_misses_total": "In-memory cache lookups that found nothing or a stale entry.",
+    "dash_bored_cache_evictions_total": "In-memory cache entries evicted to stay within budget.",
+}
+CACHE_COUNTERS = {
+    "hits": "dash_bored_cache_hits_total",
+    "misses": "dash_bored_cache_misses_total",
+    "evictions": "dash_bored_cache_evictions_total",
+}
+
+slow_log = logging.getLogger("dash_bored.slow_callbacks")
+
+_current_trace = contextvars.ContextVar("dash_bored_trace", default=None)
+_store = None
+_caches = {}
+_cache_baseline = {}
+_cache_lock = threading.Lock()
+
+
+def _metrics_store():
+    global _store
+    if _store is None:
+        _store = diskcache.Cache(str(METRICS_DIR), eviction_policy="none")
+    return _store
+
+
+def _labels(**labels):
+    return tuple(sorted(labels.items()))
+
+
+def _observe(store, metric, labels, value):
+    _, buckets, scale = HISTOGRAMS[metric]
+    store.incr((metric, labels, "bucket", bisect_left(buckets, value)))
+    store.incr((metric, labels, "sum"), int(value * scale))
+    store.incr((metric, labels, "count"))
+
+
+def _count(store, metric, labels, amount=1):
+    if amount:
+        store.incr((metric, labels, "total"), amount)
+
+
+class _Trace:
+    def __init__(self, callback):
+        self.callback = callback
+        self.stages = {}
+        self.panes = []
+        self.total = 0.0
+        self._child_time = [0.0]
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_pane(self, pane, view, seconds, stages):
+        with self._lock:
+            self.panes.append((pane, view, seconds))
+            for stage, stage_seconds in stages.items():
+                self.add(stage, stage_seconds)
+
+
+def timed(stage):
+    """Record the decorated function's exclusive time under ``stage`` in the current callback trace."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            trace._child_time.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                trace.add(stage, elapsed - trace._child_time.pop())
+                trace._child_time[-1] += elapsed
+
+        return wrapper
+
+    return decorator
+
+
+def pane_task(pane, view, func):
+    """Wrap ``func`` to render one pane of the current callback, on this or another thread."""
+    parent = _current_trace.get()
+    if parent is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = _Trace(parent.callback)
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_trace.reset(token)
+            parent.add_pane(pane, view, time.perf_counter() - start, trace.stages)
+
+    return wrapper
+
+
+def _triggered_inputs():
+    try:
+        return {item["prop_id"]: reprlib.repr(item.get("value")) for item in dash.ctx.triggered}
+    except dash.exceptions.MissingCallbackContextException:
+        return {}
+
+
+def timed_callback(func):
+    """Trace a Dash callback: total time, per-stage spans, errors and the slow-callback log.
+
+    Apply it below ``@app.callback`` so Dash registers the traced function.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = _Trace(func.__name__)
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except dash.exceptions.PreventUpdate:
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            trace.total = time.perf_counter() - start
+            _current_trace.reset(token)
+            _record_trace(trace, failed)
+            if flask.has_request_context():
+                flask.g.callback_trace = trace
+
+    return wrapper
+
+
+def _record_trace(trace, failed):
+    slow = 0 < SLOW_CALLBACK_SECONDS <= trace.total
+    labels = _labels(callback=trace.callback)
+    store = _metrics_store()
+    with store.transact():
+        _observe(store, "dash_bored_callback_seconds", labels, trace.total)
+        for stage, seconds in trace.stages.items():
+            stage_labels = _labels(callback=trace.callback, stage=stage)
+            _observe(store, "dash_bored_callback_stage_seconds", stage_labels, seconds)
+        for _, view, seconds in trace.panes:
+            _observe(store, "dash_bored_pane_seconds", _labels(callback=trace.callback, view=view), seconds)
+        _count(store, "dash_bored_callback_errors_total", labels, int(failed))
+        _count(store, "dash_bored_slow_callbacks_total", labels, int(slow))
+        _flush_cache_counters(store)
+    if slow:
+        stages = ", ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in sorted(trace.stages.items()))
+        panes = "".join(f", pane {pane} ({view})={seconds * 1000:.0f}ms" for pane, view, seconds in trace.panes)
+        slow_log.warning(
+            "slow callback %s took %.0fms (%s%s) triggered by %s",
+            trace.callback,
+            trace.total * 1000,
+            stages or "no spans",
+            panes,
+            _triggered_inputs(),
+        )
+
+
+def register_cache(name, cache):
+    """Export an ``LRUCache``'s hit/miss/eviction counters under ``cache=name``."""
+    with _cache_lock:
+        _caches[name] = cache
+        _cache_baseline[name] = {field: getattr(cache, field) for field in CACHE_COUNTERS}
+
+
+def _flush_cache_counters(store):
+    # Each process adds only what its own caches counted since its last flush.
+    with _cache_lock:
+        for name, cache in _caches.items():
+            baseline = _cache_baseline[name]
+            for field, metric in CACHE_COUNTERS.items():
+                value = getattr(cache, field)
+                _count(store, metric, _labels(cache=name), value - baseline[field])
+                baseline[field] = value
+
+
+def _reset_after_fork():
+    # A forked background job starts from its parent's counters; only count
+    # what happens in the job itself, and open its own store connection.
+    global _store, _cache_lock
+    _store = None
+    _cache_lock = threading.Lock()
+    for name, cache in _caches.items():
+        _cache_baseline[name] = {field: getattr(cache, field) for field in CACHE_COUNTERS}
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    """Render every stored metric in the Prometheus text exposition format."""
+    store = _metrics_store()
+    with store.transact():
+        _flush_cache_counters(store)
+        values = {key: store.get(key, 0) for key in store}
+
+    series = {}
+    for (metric, labels, kind, *rest), value in values.items():
+        series.setdefault(metric, {}).setdefault(labels, {})[(kind, *rest)] = value
+
+    lines = []
+    for metric, (help_text, buckets, scale) in HISTOGRAMS.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for labels, parts in sorted(series.get(metric, {}).items()):
+            cumulative = 0
+            for index, bound in enumerate((*buckets, "+Inf")):
+                cumulative += parts.get(("bucket", index), 0)
+                lines.append(f"{metric}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+            total = parts.get(("sum",), 0)
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total / scale if scale != 1 else total}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {parts.get(('count',), 0)}")
+    for metric, help_text in COUNTERS.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        for labels, parts in sorted(series.get(metric, {}).items()):
+            lines.append(f"{metric}{_format_labels(labels)} {parts.get(('total',), 0)}")
+    return "\n".join(lines) + "\n"
+
+
+def _callback_name(app, request):
+    body = request.get_json(silent=True) or {}
+    callback = app.callback_map.get(body.get("output"), {}).get("callback")
+    return getattr(callback, "__name__", "unknown")
+
+
+def install_metrics(app):
+    """Add request hooks for serialize time and response size, and a ``/metrics`` route."""
+    server = app.server
+
+    @server.before_request
+    def _start_request_timer():
+        if flask.request.path.endswith("/_dash-update-component"):
+            flask.g.request_started = time.perf_counter()
+
+    @server.after_request
+    def _record_response(response):
+        started = flask.g.pop("request_started", None)
+        if started is None or response.status_code >= 400:
+            return response
+        trace = flask.g.pop("callback_trace", None)
+        name = trace.callback if trace else _callback_name(app, flask.request)
+        labels = _labels(callback=name)
+        store = _metrics_store()
+        with store.transact():
+            _observe(store, "dash_bored_callback_response_bytes", labels, len(response.get_data()))
+            if trace is not None:
+                serialize = max(time.perf_counter() - started - trace.total, 0.0)
+                stage_labels = _labels(callback=name, stage="serialize")
+                _observe(store, "dash_bored_callback_stage_seconds", stage_labels, serialize)
+        return response
+
+    @server.route("/metrics")
+    def metrics():
+        return flask.Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUCache
+from utils.metrics import timed
+
+PAGE_SIZE = 50
+
+FILTER_OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "],
+]
+
+_sort_cache = LRUCache(max_bytes=128 * 1024 * 1024, sizeof=lambda positions: positions.nbytes)
+_positions_cache = LRUCache(max_bytes=128 * 1024 * 1024, sizeof=lambda positions: positions.nbytes)
+
+
+def split_filter_part(filter_part: str):
+    """Parse one ``{column} op value`` clause of a DataTable filter query."""
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator not in filter_part:
+                continue
+            name_part, value_part = filter_part.split(operator, 1)
+            name = name_part[name_part.find("{") + 1 : name_part.rfind("}")]
+            value_part = value_part.strip()
+            first = value_part[:1]
+            if first and first == value_part[-1] and first in ("'", '"', "`"):
+                value = value_part[1:-1].replace("\\" + first, first)
+            else:
+                try:
+                    value = float(value_part)
+                except ValueError:
+                    value = value_part
+            return name, operator_type[0].strip(), value
+    return None, None, None
+
+
+def _compare(series: pd.Series, operator: str, value):
+    if operator == "contains":
+        return series.astype(str).str.contains(str(value), regex=False, na=False)
+    if operator == "datestartswith":
+        return series.astype(str).str.startswith(str(value), na=False)
+    comparisons = {
+        "ge": series.ge,
+        "le": series.le,
+        "lt": series.lt,
+        "gt": series.gt,
+        "ne": series.ne,
+        "eq": series.eq,
+    }
+    if isinstance(value, float) and not pd.api.types.is_numeric_dtype(series):
+        value = str(int(value)) if value.is_integer() else str(value)
+    try:
+        return comparisons[operator](value)
+    except TypeError:
+        return getattr(series.astype(str), operator)(str(value))
+
+
+def filter_mask(df: pd.DataFrame, filter_query: str):
+    """Return a boolean row mask for a DataTable filter query, or None when unfiltered."""
+    if not filter_query:
+        return None
+    mask = np.ones(len(df), dtype=bool)
+    for filter_part in filter_query.split(" && "):
+        column, operator, value = split_filter_part(filter_part)
+        if column not in df.columns:
+            continue
+        mask &= _compare(df[column], operator, value).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def _sort_positions(df: pd.DataFrame, sort_spec, fingerprint) -> np.ndarray:
+    key = (fingerprint[0], sort_spec) if fingerprint else None
+    positions = _sort_cache.get(key, fingerprint) if key else None
+    if positions is None:
+        columns = [column for column, _ in sort_spec]
+        ascending = [direction == "asc" for _, direction in sort_spec]
+        ordered = df[columns].reset_index(drop=True).sort_values(columns, ascending=ascending, kind="stable")
+        positions = ordered.index.to_numpy()
+        if key:
+            _sort_cache.put(key, positions, fingerprint)
+    return positions
+
+
+def _row_positions(df: pd.DataFrame, sort_spec, filter_query, fingerprint):
+    if not sort_spec and not filter_query:
+        return None
+    key = (fingerprint[0], sort_spec, filter_query) if fingerprint else None
+    positions = _positions_cache.get(key, fingerprint) if key else None
+    if positions is None:
+        mask = filter_mask(df, filter_query)
+        if sort_spec:
+            positions = _sort_positions(df, sort_spec, fingerprint)
+            if mask is not None:
+                positions = positions[mask[positions]]
+        else:
+            positions = np.flatnonzero(mask)
+        if key:
+            _positions_cache.put(key, positions, fingerprint)
+    return positions
+
+
+@timed("transform")
+def query_page(df: pd.DataFrame, page_current, page_size, sort_by=None, filter_query="", fingerprint=None):
+    """Slice one sorted/filtered page of ``df`` for a server-side DataTable.
+
+    Sort orders and filtered row positions are memoized per dataset
+    ``fingerprint``, so paging through a sorted or filtered table only costs
+    the rows on the page. Returns ``(records, page_count)``.
+    """
+    page_size = page_size or PAGE_SIZE
+    start = (page_current or 0) * page_size
+    sort_spec = tuple(
+        (item["column_id"], item["direction"]) for item in sort_by or [] if item["column_id"] in df.columns
+    )
+    positions = _row_positions(df, sort_spec, filter_query or "", fingerprint)
+    if positions is None:
+        page = df.iloc[start : start + page_size]
+        n_rows = len(df)
+    else:
+        page = df.iloc[positions[start : start + page_size]]
+        n_rows = len(positions)
+    return page.to_dict("records"), max(math.ceil(n_rows / page_size), 1)